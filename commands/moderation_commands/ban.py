@@ -1,22 +1,8 @@
 import discord
 from discord.ext import commands
 import config
-import json
-import os
 from datetime import datetime, timezone
-
-def load_bans():
-    """Load bans from JSON file"""
-    if os.path.exists('data/bans.json'):
-        with open('data/bans.json', 'r') as f:
-            return json.load(f)
-    return {}
-
-def save_bans(bans_data):
-    """Save bans to JSON file"""
-    os.makedirs('data', exist_ok=True)
-    with open('data/bans.json', 'w') as f:
-        json.dump(bans_data, f, indent=2)
+from utils.case_store import get_case_store
 
 def setup(bot):
     @bot.command(name='ban')
@@ -43,11 +29,7 @@ def setup(bot):
             return
         
         try:
-            # Load existing bans
-            bans_data = load_bans()
-            
             # Create ban record
-            ban_id = str(len(bans_data) + 1)
             ban_record = {
                 'user_id': member.id,
                 'user_name': str(member),
@@ -59,8 +41,7 @@ def setup(bot):
             }
             
             # Save ban record
-            bans_data[ban_id] = ban_record
-            save_bans(bans_data)
+            ban_id = await get_case_store().add_case('ban', ban_record)
             
             # Try to DM the user before banning
             try:
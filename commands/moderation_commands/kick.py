@@ -1,22 +1,8 @@
 import discord
 from discord.ext import commands
 import config
-import json
-import os
 from datetime import datetime, timezone
-
-def load_kicks():
-    """Load kicks from JSON file"""
-    if os.path.exists('data/kicks.json'):
-        with open('data/kicks.json', 'r') as f:
-            return json.load(f)
-    return {}
-
-def save_kicks(kicks_data):
-    """Save kicks to JSON file"""
-    os.makedirs('data', exist_ok=True)
-    with open('data/kicks.json', 'w') as f:
-        json.dump(kicks_data, f, indent=2)
+from utils.case_store import get_case_store
 
 def setup(bot):
     @bot.command(name='kick')
@@ -43,11 +29,7 @@ def setup(bot):
             return
         
         try:
-            # Load existing kicks
-            kicks_data = load_kicks()
-            
             # Create kick record
-            kick_id = str(len(kicks_data) + 1)
             kick_record = {
                 'user_id': member.id,
                 'user_name': str(member),
@@ -59,8 +41,7 @@ def setup(bot):
             }
             
             # Save kick record
-            kicks_data[kick_id] = kick_record
-            save_kicks(kicks_data)
+            kick_id = await get_case_store().add_case('kick', kick_record)
             
             # Try to DM the user before kicking
             try:
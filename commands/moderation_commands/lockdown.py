@@ -1,22 +1,8 @@
 import discord
 from discord.ext import commands
 import config
-import json
-import os
 from datetime import datetime, timezone
-
-def load_lockdowns():
-    """Load lockdowns from JSON file"""
-    if os.path.exists('data/lockdowns.json'):
-        with open('data/lockdowns.json', 'r') as f:
-            return json.load(f)
-    return {}
-
-def save_lockdowns(lockdowns_data):
-    """Save lockdowns to JSON file"""
-    os.makedirs('data', exist_ok=True)
-    with open('data/lockdowns.json', 'w') as f:
-        json.dump(lockdowns_data, f, indent=2)
+from utils.case_store import get_case_store
 
 def setup(bot):
     @bot.command(name='lockdown')
@@ -36,11 +22,7 @@ def setup(bot):
             # Store original permissions
             original_perms = target_channel.overwrites_for(everyone_role)
             
-            # Load existing lockdowns
-            lockdowns_data = load_lockdowns()
-            
             # Create lockdown record
-            lockdown_id = str(len(lockdowns_data) + 1)
             lockdown_record = {
                 'channel_id': target_channel.id,
                 'channel_name': target_channel.name,
@@ -54,8 +36,8 @@ def setup(bot):
             }
             
             # Save lockdown record
-            lockdowns_data[lockdown_id] = lockdown_record
-            save_lockdowns(lockdowns_data)
+            store = get_case_store()
+            lockdown_id = await store.add_case('lockdown', lockdown_record)
             
             # Apply lockdown (deny send_messages for @everyone)
             await target_channel.set_permissions(
@@ -123,22 +105,16 @@ def setup(bot):
         target_channel = channel or ctx.channel
         
         try:
-            # Load lockdowns
-            lockdowns_data = load_lockdowns()
-            
             # Find active lockdown for this channel
-            lockdown_record = None
-            lockdown_id = None
-            for lid, record in lockdowns_data.items():
-                if record['channel_id'] == target_channel.id and record.get('active', True):
-                    lockdown_record = record
-                    lockdown_id = lid
-                    break
-            
-            if not lockdown_record:
+            store = get_case_store()
+            active_lockdown = store.get_active_channel_case(ctx.guild.id, target_channel.id, 'lockdown')
+            
+            if not active_lockdown:
                 await ctx.send("This channel is not currently locked down.")
                 return
             
+            lockdown_id, lockdown_record = active_lockdown
+            
             # Get the @everyone role
             everyone_role = ctx.guild.default_role
             
@@ -152,11 +128,12 @@ def setup(bot):
             )
             
             # Update lockdown record
-            lockdown_record['active'] = False
-            lockdown_record['unlocked_by'] = ctx.author.id
-            lockdown_record['unlocked_at'] = datetime.now(timezone.utc).isoformat()
-            lockdown_record['unlock_reason'] = reason
-            save_lockdowns(lockdowns_data)
+            await store.update_case('lockdown', lockdown_id, {
+                'active': False,
+                'unlocked_by': ctx.author.id,
+                'unlocked_at': datetime.now(timezone.utc).isoformat(),
+                'unlock_reason': reason
+            })
             
             # Send confirmation
             success_embed = discord.Embed(
@@ -204,4 +181,43 @@ def setup(bot):
         except discord.Forbidden:
             await ctx.send("I don't have permission to modify this channel's permissions.")
         except Exception as e:
-            await ctx.send(f"An error occurred: {str(e)}")
\ No newline at end of file
+            await ctx.send(f"An error occurred: {str(e)}")
+
+    @bot.command(name='lockdowns')
+    async def list_lockdowns(ctx):
+        """List all channels that are currently locked down"""
+        # Check if user has moderation role
+        if not any(role.id == config.MODERATION_ROLE_ID for role in ctx.author.roles):
+            await ctx.send("You don't have permission to use this command.")
+            return
+        
+        try:
+            active_lockdowns = get_case_store().list_active_channel_cases(ctx.guild.id, 'lockdown')
+            
+            embed = discord.Embed(
+                title="🔒 Active Lockdowns",
+                color=0xFFFFFF,
+                timestamp=discord.utils.utcnow()
+            )
+            
+            if not active_lockdowns:
+                embed.description = "No channels are currently locked down."
+            
+            # Embeds allow at most 25 fields
+            for lockdown_id, record in active_lockdowns[:25]:
+                locked_at = datetime.fromisoformat(record['timestamp'])
+                embed.add_field(
+                    name=f"#{record['channel_name']} (Lockdown #{lockdown_id})",
+                    value=f"**Channel:** <#{record['channel_id']}>\n**By:** {record['moderator_name']}\n**Since:** <t:{int(locked_at.timestamp())}:R>\n**Reason:** {record['reason']}",
+                    inline=False
+                )
+            
+            if len(active_lockdowns) > 25:
+                embed.set_footer(text=f"Showing 25 of {len(active_lockdowns)} active lockdowns")
+            
+            embed.set_image(url="https://media.discordapp.net/attachments/1393317286248448200/1393317450367369277/image.png?ex=6872bb7e&is=687169fe&hm=679a83259dbb1029cd71ad93e4b74d7979a48365ec7969cebeacfd9905a1d3b4&=&format=webp&quality=lossless")
+            
+            await ctx.send(embed=embed)
+        
+        except Exception as e:
+            await ctx.send(f"An error occurred: {str(e)}")
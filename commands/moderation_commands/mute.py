@@ -1,23 +1,10 @@
 import discord
 from discord.ext import commands
 import config
-import json
-import os
 from datetime import datetime, timezone, timedelta
 import asyncio
-
-def load_mutes():
-    """Load mutes from JSON file"""
-    if os.path.exists('data/mutes.json'):
-        with open('data/mutes.json', 'r') as f:
-            return json.load(f)
-    return {}
-
-def save_mutes(mutes_data):
-    """Save mutes to JSON file"""
-    os.makedirs('data', exist_ok=True)
-    with open('data/mutes.json', 'w') as f:
-        json.dump(mutes_data, f, indent=2)
+from utils.case_store import get_case_store
+from utils.mute_scheduler import mute_scheduler
 
 def parse_duration(duration_str):
     """Parse duration string like '1h', '30m', '1d' into seconds"""
@@ -96,9 +83,6 @@ def setup(bot):
                 return
         
         try:
-            # Load existing mutes
-            mutes_data = load_mutes()
-            
             # Create timeout duration
             until = None
             if duration_seconds:
@@ -108,7 +92,6 @@ def setup(bot):
             await member.timeout(until, reason=f"{reason} - Muted by {ctx.author}")
             
             # Create mute record
-            mute_id = str(len(mutes_data) + 1)
             mute_record = {
                 'user_id': member.id,
                 'user_name': str(member),
@@ -123,8 +106,8 @@ def setup(bot):
             }
             
             # Save mute record
-            mutes_data[mute_id] = mute_record
-            save_mutes(mutes_data)
+            mute_id = await get_case_store().add_case('mute', mute_record)
+            mute_scheduler.track(mute_id, mute_record)
             
             # Try to DM the user
             try:
@@ -205,14 +188,15 @@ def setup(bot):
             await member.timeout(None, reason=f"{reason} - Unmuted by {ctx.author}")
             
             # Update mute records
-            mutes_data = load_mutes()
-            for mute_id, mute_record in mutes_data.items():
-                if mute_record['user_id'] == member.id and mute_record.get('active', True):
-                    mute_record['active'] = False
-                    mute_record['unmuted_by'] = ctx.author.id
-                    mute_record['unmuted_at'] = datetime.now(timezone.utc).isoformat()
-                    mute_record['unmute_reason'] = reason
-            save_mutes(mutes_data)
+            store = get_case_store()
+            for mute_id in mute_scheduler.active_mute_ids(ctx.guild.id, member.id):
+                mute_record = await store.update_case('mute', mute_id, {
+                    'active': False,
+                    'unmuted_by': ctx.author.id,
+                    'unmuted_at': datetime.now(timezone.utc).isoformat(),
+                    'unmute_reason': reason
+                })
+                mute_scheduler.untrack(mute_id, mute_record)
             
             # Send confirmation
             success_embed = discord.Embed(
@@ -1,22 +1,8 @@
 import discord
 from discord.ext import commands
 import config
-import json
-import os
 from datetime import datetime, timezone
-
-def load_notes():
-    """Load notes from JSON file"""
-    if os.path.exists('data/notes.json'):
-        with open('data/notes.json', 'r') as f:
-            return json.load(f)
-    return {}
-
-def save_notes(notes_data):
-    """Save notes to JSON file"""
-    os.makedirs('data', exist_ok=True)
-    with open('data/notes.json', 'w') as f:
-        json.dump(notes_data, f, indent=2)
+from utils.case_store import get_case_store
 
 def setup(bot):
     @bot.command(name='note')
@@ -28,11 +14,7 @@ def setup(bot):
             return
         
         try:
-            # Load existing notes
-            notes_data = load_notes()
-            
             # Create note record
-            note_id = str(len(notes_data) + 1)
             note_record = {
                 'user_id': member.id,
                 'user_name': str(member),
@@ -44,8 +26,7 @@ def setup(bot):
             }
             
             # Save note record
-            notes_data[note_id] = note_record
-            save_notes(notes_data)
+            note_id = await get_case_store().add_case('note', note_record)
             
             # Send confirmation
             success_embed = discord.Embed(
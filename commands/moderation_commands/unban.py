@@ -1,35 +1,8 @@
 import discord
 from discord.ext import commands
 import config
-import json
-import os
 from datetime import datetime, timezone
-
-def load_bans():
-    """Load bans from JSON file"""
-    if os.path.exists('data/bans.json'):
-        with open('data/bans.json', 'r') as f:
-            return json.load(f)
-    return {}
-
-def save_bans(bans_data):
-    """Save bans to JSON file"""
-    os.makedirs('data', exist_ok=True)
-    with open('data/bans.json', 'w') as f:
-        json.dump(bans_data, f, indent=2)
-
-def load_unbans():
-    """Load unbans from JSON file"""
-    if os.path.exists('data/unbans.json'):
-        with open('data/unbans.json', 'r') as f:
-            return json.load(f)
-    return {}
-
-def save_unbans(unbans_data):
-    """Save unbans to JSON file"""
-    os.makedirs('data', exist_ok=True)
-    with open('data/unbans.json', 'w') as f:
-        json.dump(unbans_data, f, indent=2)
+from utils.case_store import get_case_store
 
 def setup(bot):
     @bot.command(name='unban')
@@ -54,11 +27,7 @@ def setup(bot):
                 await ctx.send(f"User with ID {user_id} is not banned from this server.")
                 return
             
-            # Load existing unbans
-            unbans_data = load_unbans()
-            
             # Create unban record
-            unban_id = str(len(unbans_data) + 1)
             unban_record = {
                 'user_id': user_id,
                 'user_name': str(banned_user),
@@ -70,8 +39,7 @@ def setup(bot):
             }
             
             # Save unban record
-            unbans_data[unban_id] = unban_record
-            save_unbans(unbans_data)
+            unban_id = await get_case_store().add_case('unban', unban_record)
             
             # Unban the user
             await ctx.guild.unban(banned_user, reason=f"{reason} - Unbanned by {ctx.author}")
@@ -1,35 +1,8 @@
 import discord
 from discord.ext import commands
 import config
-import json
-import os
 from datetime import datetime, timezone
-
-def load_mutes():
-    """Load mutes from JSON file"""
-    if os.path.exists('data/mutes.json'):
-        with open('data/mutes.json', 'r') as f:
-            return json.load(f)
-    return {}
-
-def save_mutes(mutes_data):
-    """Save mutes to JSON file"""
-    os.makedirs('data', exist_ok=True)
-    with open('data/mutes.json', 'w') as f:
-        json.dump(mutes_data, f, indent=2)
-
-def load_unmutes():
-    """Load unmutes from JSON file"""
-    if os.path.exists('data/unmutes.json'):
-        with open('data/unmutes.json', 'r') as f:
-            return json.load(f)
-    return {}
-
-def save_unmutes(unmutes_data):
-    """Save unmutes to JSON file"""
-    os.makedirs('data', exist_ok=True)
-    with open('data/unmutes.json', 'w') as f:
-        json.dump(unmutes_data, f, indent=2)
+from utils.case_store import get_case_store
 
 def setup(bot):
     @bot.command(name='unmute')
@@ -56,11 +29,7 @@ def setup(bot):
                 await ctx.send(f"{member.mention} is not currently muted.")
                 return
             
-            # Load existing unmutes
-            unmutes_data = load_unmutes()
-            
             # Create unmute record
-            unmute_id = str(len(unmutes_data) + 1)
             unmute_record = {
                 'user_id': member.id,
                 'user_name': str(member),
@@ -72,8 +41,7 @@ def setup(bot):
             }
             
             # Save unmute record
-            unmutes_data[unmute_id] = unmute_record
-            save_unmutes(unmutes_data)
+            unmute_id = await get_case_store().add_case('unmute', unmute_record)
             
             # Try to DM the user before unmuting
             try:
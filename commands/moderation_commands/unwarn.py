@@ -1,35 +1,8 @@
 import discord
 from discord.ext import commands
 import config
-import json
-import os
 from datetime import datetime, timezone
-
-def load_warnings():
-    """Load warnings from JSON file"""
-    if os.path.exists('data/warnings.json'):
-        with open('data/warnings.json', 'r') as f:
-            return json.load(f)
-    return {}
-
-def save_warnings(warnings_data):
-    """Save warnings to JSON file"""
-    os.makedirs('data', exist_ok=True)
-    with open('data/warnings.json', 'w') as f:
-        json.dump(warnings_data, f, indent=2)
-
-def load_unwarns():
-    """Load unwarns from JSON file"""
-    if os.path.exists('data/unwarns.json'):
-        with open('data/unwarns.json', 'r') as f:
-            return json.load(f)
-    return {}
-
-def save_unwarns(unwarns_data):
-    """Save unwarns to JSON file"""
-    os.makedirs('data', exist_ok=True)
-    with open('data/unwarns.json', 'w') as f:
-        json.dump(unwarns_data, f, indent=2)
+from utils.case_store import get_case_store
 
 def setup(bot):
     @bot.command(name='unwarn')
@@ -41,16 +14,14 @@ def setup(bot):
             return
         
         try:
-            # Load warnings data
-            warnings_data = load_warnings()
+            store = get_case_store()
             
             # Check if warning exists
-            if warning_id not in warnings_data:
+            warning_record = store.get_case('warn', warning_id)
+            if warning_record is None:
                 await ctx.send(f"Warning with ID `{warning_id}` not found.")
                 return
             
-            warning_record = warnings_data[warning_id]
-            
             # Get the user from the warning record
             try:
                 user = bot.get_user(warning_record['user_id'])
@@ -59,11 +30,7 @@ def setup(bot):
             except:
                 user = None
             
-            # Load existing unwarns
-            unwarns_data = load_unwarns()
-            
             # Create unwarn record
-            unwarn_id = str(len(unwarns_data) + 1)
             unwarn_record = {
                 'warning_id': warning_id,
                 'user_id': warning_record['user_id'],
@@ -77,12 +44,10 @@ def setup(bot):
             }
             
             # Save unwarn record
-            unwarns_data[unwarn_id] = unwarn_record
-            save_unwarns(unwarns_data)
+            unwarn_id = await store.add_case('unwarn', unwarn_record)
             
             # Remove the warning
-            del warnings_data[warning_id]
-            save_warnings(warnings_data)
+            await store.delete_case('warn', warning_id)
             
             # Try to DM the user
             if user:
@@ -1,30 +1,13 @@
 import discord
 from discord.ext import commands
 import config
-import json
-import os
 from datetime import datetime, timezone
+from utils.case_store import get_case_store
 
-def load_warnings():
-    """Load warnings from JSON file"""
-    if os.path.exists('data/warnings.json'):
-        with open('data/warnings.json', 'r') as f:
-            return json.load(f)
-    return {}
-
-def save_warnings(warnings_data):
-    """Save warnings to JSON file"""
-    os.makedirs('data', exist_ok=True)
-    with open('data/warnings.json', 'w') as f:
-        json.dump(warnings_data, f, indent=2)
-
-def get_user_warnings(user_id, warnings_data):
-    """Get all warnings for a specific user"""
-    user_warnings = []
-    for warn_id, warning in warnings_data.items():
-        if warning['user_id'] == user_id and warning.get('active', True):
-            user_warnings.append(warning)
-    return user_warnings
+def get_user_warnings(guild_id, user_id):
+    """Get all active warnings for a specific user"""
+    store = get_case_store()
+    return [warning for warn_id, warning in store.get_user_cases(guild_id, user_id, 'warn', active_only=True)]
 
 def setup(bot):
     @bot.command(name='warn')
@@ -46,11 +29,7 @@ def setup(bot):
             return
         
         try:
-            # Load existing warnings
-            warnings_data = load_warnings()
-            
             # Create warning record
-            warn_id = str(len(warnings_data) + 1)
             warning_record = {
                 'user_id': member.id,
                 'user_name': str(member),
@@ -63,11 +42,10 @@ def setup(bot):
             }
             
             # Save warning record
-            warnings_data[warn_id] = warning_record
-            save_warnings(warnings_data)
+            warn_id = await get_case_store().add_case('warn', warning_record)
             
             # Get user's total warnings
-            user_warnings = get_user_warnings(member.id, warnings_data)
+            user_warnings = get_user_warnings(ctx.guild.id, member.id)
             warning_count = len(user_warnings)
             
             # Try to DM the user
@@ -2,7 +2,8 @@
 import discord
 from discord.ext import commands
 import config
-from utils.ticket_utils import has_staff_permissions
+from utils.ticket_utils import has_staff_permissions, get_ticket_channels
+from utils.broadcast import broadcast
 
 def setup(bot):
     @bot.command(name='patience')
@@ -14,8 +15,7 @@ def setup(bot):
             return
         
         # Get all ticket channels
-        ticket_channels = [channel for channel in ctx.guild.channels 
-                          if isinstance(channel, discord.TextChannel) and channel.name.startswith("ticket-")]
+        ticket_channels = get_ticket_channels(ctx.guild)
         
         if not ticket_channels:
             await ctx.send("No ticket channels found.")
@@ -29,13 +29,6 @@ def setup(bot):
         )
         embed.set_image(url="https://media.discordapp.net/attachments/1393317286248448200/1393317450367369277/image.png?ex=6872bb7e&is=687169fe&hm=679a83259dbb1029cd71ad93e4b74d7979a48365ec7969cebeacfd9905a1d3b4&=&format=webp&quality=lossless")
         
-        # Send to all ticket channels
-        sent_count = 0
-        for channel in ticket_channels:
-            try:
-                await channel.send(embed=embed)
-                sent_count += 1
-            except discord.Forbidden:
-                continue  # Skip channels where bot doesn't have permission
-        
-        await ctx.send(f"Patience message sent to {sent_count} ticket channels.")
+        # Send to all ticket channels, reporting progress in the status message
+        status_message = await ctx.send(f"Sending patience message to {len(ticket_channels)} ticket channels...")
+        await broadcast(ticket_channels, lambda channel: channel.send(embed=embed), status_message=status_message, label="Patience message")
@@ -3,6 +3,7 @@ import discord
 from discord.ext import commands
 import config
 from utils.ticket_utils import is_ticket_channel, has_staff_permissions
+from utils.ticket_registry import get_ticket, update_ticket
 
 def setup(bot):
     @bot.command(name='add')
@@ -27,6 +28,11 @@ def setup(bot):
         
         await ctx.channel.set_permissions(member, overwrite=overwrite)
         
+        # Keep track of who was added to the ticket
+        record = get_ticket(ctx.channel.id)
+        if record is not None and member.id not in record["member_ids"]:
+            await update_ticket(ctx.channel.id, {"member_ids": record["member_ids"] + [member.id]})
+        
         embed = discord.Embed(
             title="<:Tick:1393269945500045473> User Added",
             description=f"{member.mention} has been added to this ticket!",
@@ -1,35 +1,51 @@
 import discord
 from discord.ext import commands
-import json
-import os
+from utils.write_behind import JsonStore
+from utils.storage import file_lock
 
 # File to store blacklisted users
 BLACKLIST_FILE = "data/ticket_blacklist.json"
 
+# guild_id -> set of blacklisted user IDs, so the ticket button never touches the disk
+blacklisted_ids = {}
+
+def index_blacklist(blacklist_data):
+    """Rebuild the per-guild sets whenever the blacklist file is (re)loaded"""
+    global blacklisted_ids
+    blacklisted_ids = {
+        int(guild_id): {int(user_id) for user_id in users}
+        for guild_id, users in blacklist_data.items()
+    }
+
+# Loaded once at startup, written back in the background and reloaded if edited by hand
+blacklist_store = JsonStore(BLACKLIST_FILE, on_load=index_blacklist)
+
 def load_blacklist():
-    """Load the blacklist from file"""
-    if not os.path.exists(BLACKLIST_FILE):
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(BLACKLIST_FILE), exist_ok=True)
-        return {}
-    
-    try:
-        with open(BLACKLIST_FILE, 'r') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, FileNotFoundError):
-        return {}
-
-def save_blacklist(blacklist_data):
-    """Save the blacklist to file"""
-    os.makedirs(os.path.dirname(BLACKLIST_FILE), exist_ok=True)
-    with open(BLACKLIST_FILE, 'w') as f:
-        json.dump(blacklist_data, f, indent=2)
+    """Get the in-memory blacklist"""
+    return blacklist_store.data
+
+async def add_blacklist_entry(guild_id, user_id, entry):
+    """Add a user to a guild's blacklist"""
+    async with file_lock(BLACKLIST_FILE):
+        blacklist_store.data.setdefault(str(guild_id), {})[str(user_id)] = entry
+        blacklisted_ids.setdefault(int(guild_id), set()).add(int(user_id))
+        blacklist_store.mark_dirty(str(guild_id))
+
+async def remove_blacklist_entry(guild_id, user_id):
+    """Remove a user from a guild's blacklist"""
+    async with file_lock(BLACKLIST_FILE):
+        guild_blacklist = blacklist_store.data.get(str(guild_id), {})
+        guild_blacklist.pop(str(user_id), None)
+        blacklisted_ids.get(int(guild_id), set()).discard(int(user_id))
+
+        # Clean up empty guild entries
+        if not guild_blacklist:
+            blacklist_store.data.pop(str(guild_id), None)
+        blacklist_store.mark_dirty(str(guild_id))
 
 def is_user_blacklisted(user_id, guild_id):
     """Check if a user is blacklisted from creating tickets"""
-    blacklist = load_blacklist()
-    guild_blacklist = blacklist.get(str(guild_id), {})
-    return str(user_id) in guild_blacklist
+    return int(user_id) in blacklisted_ids.get(int(guild_id), ())
 
 def setup(bot):
 
@@ -63,12 +79,8 @@ def setup(bot):
         guild_id = str(ctx.guild.id)
         user_id = str(user.id)
 
-        # Initialize guild blacklist if it doesn't exist
-        if guild_id not in blacklist:
-            blacklist[guild_id] = {}
-
         # Check if user is already blacklisted
-        if user_id in blacklist[guild_id]:
+        if user_id in blacklist.get(guild_id, {}):
             embed = discord.Embed(
                 title="<:Warning:1393269985031487528> Already Blacklisted",
                 description=f"{user.mention} is already blacklisted from creating tickets.",
@@ -79,16 +91,13 @@ def setup(bot):
             return
 
         # Add user to blacklist
-        blacklist[guild_id][user_id] = {
+        await add_blacklist_entry(guild_id, user_id, {
             "username": user.name,
             "discriminator": user.discriminator,
             "reason": reason,
             "blacklisted_by": ctx.author.id,
             "blacklisted_at": ctx.message.created_at.isoformat()
-        }
-
-        # Save blacklist
-        save_blacklist(blacklist)
+        })
 
         # Send success message
         embed = discord.Embed(
@@ -143,14 +152,7 @@ def setup(bot):
             return
 
         # Remove user from blacklist
-        del blacklist[guild_id][user_id]
-
-        # Clean up empty guild entries
-        if not blacklist[guild_id]:
-            del blacklist[guild_id]
-
-        # Save blacklist
-        save_blacklist(blacklist)
+        await remove_blacklist_entry(guild_id, user_id)
 
         # Send success message
         embed = discord.Embed(
@@ -3,6 +3,10 @@ import discord
 from discord.ext import commands
 import config
 from utils.ticket_utils import is_ticket_channel, has_staff_permissions
+from utils.ticket_registry import get_ticket, update_ticket
+from utils.ticket_metrics import record_claim
+from utils.topic_updater import topic_updater
+from utils.ticket_assigner import ticket_assigner
 
 def setup(bot):
     @bot.command(name='claim')
@@ -18,14 +22,21 @@ def setup(bot):
             return
         
         # Check if ticket is already claimed
-        topic = ctx.channel.topic or ""
-        if "Claimed by:" in topic:
+        record = get_ticket(ctx.channel.id)
+        claimed = record["claimer_id"] is not None if record else "Claimed by:" in (ctx.channel.topic or "")
+        if claimed:
             await ctx.send("This ticket is already claimed!")
             return
         
-        # Update channel topic to show who claimed it
-        new_topic = f"Claimed by: {ctx.author.display_name}"
-        await ctx.channel.edit(topic=new_topic)
+        await update_ticket(ctx.channel.id, {"claimer_id": ctx.author.id, "claimer_name": ctx.author.display_name, "auto_assigned": False})
+        await record_claim(ctx.channel.id)
+        ticket_assigner.claimed(ctx.guild.id, ctx.author.id, ctx.channel.id)
+        
+        # Update channel topic to show who claimed it, registered tickets get it written in the background
+        if record is not None:
+            topic_updater.schedule(ctx.channel)
+        else:
+            await ctx.channel.edit(topic=f"Claimed by: {ctx.author.display_name}")
         
         embed = discord.Embed(
             title="<:Tick:1393269945500045473> Ticket Claimed",
@@ -49,13 +60,20 @@ def setup(bot):
             return
         
         # Check if ticket is claimed
-        topic = ctx.channel.topic or ""
-        if "Claimed by:" not in topic:
+        record = get_ticket(ctx.channel.id)
+        claimed = record["claimer_id"] is not None if record else "Claimed by:" in (ctx.channel.topic or "")
+        if not claimed:
             await ctx.send("This ticket is not currently claimed!")
             return
         
+        await update_ticket(ctx.channel.id, {"claimer_id": None, "claimer_name": None, "auto_assigned": False})
+        ticket_assigner.released(ctx.channel.id)
+        
         # Remove claim from topic
-        await ctx.channel.edit(topic="")
+        if record is not None:
+            topic_updater.schedule(ctx.channel)
+        else:
+            await ctx.channel.edit(topic="")
         
         embed = discord.Embed(
             title="<:Cross:1393269948700426341> Ticket Unclaimed",
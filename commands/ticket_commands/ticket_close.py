@@ -3,7 +3,92 @@ from discord.ext import commands
 import config
 from datetime import timedelta
 from utils.ticket_utils import is_ticket_channel, has_staff_permissions
-from utils.transcript_utils import generate_transcript, get_ticket_info_from_channel
+from utils.transcript_utils import transcript_file, get_ticket_info_from_channel
+from utils.transcript_capture import finalize_transcript
+from utils.transcript_archive import get_transcript_archive
+from utils.storage import run_io
+from utils.ticket_registry import get_ticket
+from utils.ticket_metrics import record_close
+from utils.interactions import defer_and_run
+
+async def archive_transcript(channel, closed_by, close_reason, ticket_owner, claimed_by, ticket_reason, transcript):
+    """Keep a searchable copy of the transcript in the local archive"""
+    try:
+        await run_io(get_transcript_archive().archive, transcript, {
+            "guild_id": channel.guild.id,
+            "channel_id": channel.id,
+            "channel_name": channel.name,
+            "owner_id": ticket_owner.id if ticket_owner else None,
+            "owner_name": str(ticket_owner) if ticket_owner else None,
+            "closed_by_id": closed_by.id,
+            "claimed_by": claimed_by,
+            "reason": ticket_reason,
+            "close_reason": close_reason,
+            "closed_at": discord.utils.utcnow().isoformat()
+        })
+    except Exception as e:
+        print(f"Error archiving transcript for {channel.name}: {e}")
+
+async def send_close_logs(channel, closed_by, close_reason, ticket_owner, claimed_by, ticket_reason, transcript):
+    """Send the close log and the owner DM, both with the same transcript"""
+    # Log to log channel
+    log_channel = channel.guild.get_channel(config.LOG_CHANNEL_ID)
+    if log_channel:
+        log_embed = discord.Embed(
+            title="<:Cross:1393269948700426341> Ticket Closed",
+            color=0xFFFFFF,
+            timestamp=discord.utils.utcnow()
+        )
+        log_embed.add_field(name="Ticket Owner", value=ticket_owner.mention if ticket_owner else "Unknown", inline=True)
+        log_embed.add_field(name="Closed By", value=closed_by.mention, inline=True)
+        log_embed.add_field(name="Claimed By", value=claimed_by if claimed_by else "Unclaimed", inline=True)
+        log_embed.add_field(name="Channel", value=channel.name, inline=True)
+        log_embed.add_field(name="Original Reason", value=ticket_reason, inline=True)
+        log_embed.add_field(name="Close Reason", value=close_reason, inline=True)
+        log_embed.set_image(url="https://media.discordapp.net/attachments/1393317286248448200/1393317450367369277/image.png?ex=6872bb7e&is=687169fe&hm=679a83259dbb1029cd71ad93e4b74d7979a48365ec7969cebeacfd9905a1d3b4&=&format=webp&quality=lossless")
+        
+        await log_channel.send(embed=log_embed, file=transcript_file(transcript))
+    
+    # Send DM to ticket owner
+    if ticket_owner:
+        try:
+            dm_embed = discord.Embed(
+                title="<:Cross:1393269948700426341> Your Ticket Has Been Closed",
+                color=0xFFFFFF,
+                timestamp=discord.utils.utcnow()
+            )
+            dm_embed.add_field(name="Server", value=channel.guild.name, inline=True)
+            dm_embed.add_field(name="Closed By", value=closed_by.display_name, inline=True)
+            dm_embed.add_field(name="Claimed By", value=claimed_by if claimed_by else "Unclaimed", inline=True)
+            dm_embed.add_field(name="Close Reason", value=close_reason, inline=True)
+            dm_embed.set_image(url="https://media.discordapp.net/attachments/1393317286248448200/1393317450367369277/image.png?ex=6872bb7e&is=687169fe&hm=679a83259dbb1029cd71ad93e4b74d7979a48365ec7969cebeacfd9905a1d3b4&=&format=webp&quality=lossless")
+            
+            await ticket_owner.send(embed=dm_embed, file=transcript_file(transcript))
+        except discord.Forbidden:
+            pass
+
+async def log_ticket_close(channel, closed_by, close_reason):
+    """Build the transcript once, then send the close logs and archive it"""
+    # Get ticket information
+    ticket_owner, claimed_by = get_ticket_info_from_channel(channel)
+    
+    # Render the transcript from the live capture log, tickets opened before the registry existed take their reason from it
+    transcript, ticket_reason = await finalize_transcript(channel)
+    record = get_ticket(channel.id)
+    if record is not None:
+        ticket_reason = record["reason"]
+    try:
+        await send_close_logs(channel, closed_by, close_reason, ticket_owner, claimed_by, ticket_reason, transcript)
+        await archive_transcript(channel, closed_by, close_reason, ticket_owner, claimed_by, ticket_reason, transcript)
+    finally:
+        transcript.close()
+    
+    await record_close(channel.id)
+
+async def close_ticket(channel, closed_by, close_reason):
+    """Close a ticket without confirmation: log it, archive the transcript and delete the channel"""
+    await log_ticket_close(channel, closed_by, close_reason)
+    await channel.delete(reason=f"Ticket closed by {closed_by} - {close_reason}")
 
 class TicketCloseView(discord.ui.View):
     def __init__(self, ctx, close_reason):
@@ -19,63 +104,18 @@ class TicketCloseView(discord.ui.View):
             return
         
         self.responded = True
-        await interaction.response.send_message("Generating transcript and closing ticket...")
-        
-        # Get ticket information
-        ticket_owner, claimed_by = get_ticket_info_from_channel(self.ctx.channel)
-        
-        # Get original ticket reason
-        ticket_reason = "No reason provided"
-        async for message in self.ctx.channel.history(limit=50, oldest_first=True):
-            if message.embeds and "Support Ticket" in str(message.embeds[0].title):
-                embed_desc = message.embeds[0].description
-                if "**Reason:**" in embed_desc:
-                    ticket_reason = embed_desc.split("**Reason:**")[1].split("\n")[0].strip()
-                break
+        self.stop()
         
-        # Generate transcript
-        transcript = await generate_transcript(self.ctx.channel)
+        async def generate_and_log():
+            await log_ticket_close(self.ctx.channel, self.ctx.author, self.close_reason)
+            return "Transcript saved. Ticket will be deleted in 3 seconds..."
         
-        # Log to log channel
-        log_channel = self.ctx.guild.get_channel(config.LOG_CHANNEL_ID)
-        if log_channel:
-            log_embed = discord.Embed(
-                title="<:Cross:1393269948700426341> Ticket Closed",
-                color=0xFFFFFF,
-                timestamp=discord.utils.utcnow()
-            )
-            log_embed.add_field(name="Ticket Owner", value=ticket_owner.mention if ticket_owner else "Unknown", inline=True)
-            log_embed.add_field(name="Closed By", value=self.ctx.author.mention, inline=True)
-            log_embed.add_field(name="Claimed By", value=claimed_by if claimed_by else "Unclaimed", inline=True)
-            log_embed.add_field(name="Channel", value=self.ctx.channel.name, inline=True)
-            log_embed.add_field(name="Original Reason", value=ticket_reason, inline=True)
-            log_embed.add_field(name="Close Reason", value=self.close_reason, inline=True)
-            log_embed.set_image(url="https://media.discordapp.net/attachments/1393317286248448200/1393317450367369277/image.png?ex=6872bb7e&is=687169fe&hm=679a83259dbb1029cd71ad93e4b74d7979a48365ec7969cebeacfd9905a1d3b4&=&format=webp&quality=lossless")
-            
-            await log_channel.send(embed=log_embed, file=transcript)
-        
-        # Send DM to ticket owner
-        if ticket_owner:
-            try:
-                dm_embed = discord.Embed(
-                    title="<:Cross:1393269948700426341> Your Ticket Has Been Closed",
-                    color=0xFFFFFF,
-                    timestamp=discord.utils.utcnow()
-                )
-                dm_embed.add_field(name="Server", value=self.ctx.guild.name, inline=True)
-                dm_embed.add_field(name="Closed By", value=self.ctx.author.display_name, inline=True)
-                dm_embed.add_field(name="Claimed By", value=claimed_by if claimed_by else "Unclaimed", inline=True)
-                dm_embed.add_field(name="Close Reason", value=self.close_reason, inline=True)
-                dm_embed.set_image(url="https://media.discordapp.net/attachments/1393317286248448200/1393317450367369277/image.png?ex=6872bb7e&is=687169fe&hm=679a83259dbb1029cd71ad93e4b74d7979a48365ec7969cebeacfd9905a1d3b4&=&format=webp&quality=lossless")
-                
-                dm_transcript = await generate_transcript(self.ctx.channel)
-                await ticket_owner.send(embed=dm_embed, file=dm_transcript)
-            except discord.Forbidden:
-                pass
+        async def delete_channel():
+            await discord.utils.sleep_until(discord.utils.utcnow() + timedelta(seconds=3))
+            await self.ctx.channel.delete(reason=f"Ticket closed by {self.ctx.author} - {self.close_reason}")
         
-        await interaction.followup.send("Ticket will be deleted in 3 seconds...")
-        await discord.utils.sleep_until(discord.utils.utcnow() + timedelta(seconds=3))
-        await self.ctx.channel.delete(reason=f"Ticket closed by {self.ctx.author} - {self.close_reason}")
+        # Generating the transcript can take a while, so acknowledge first and follow up when it's done
+        await defer_and_run(interaction, generate_and_log, ephemeral=False, after=delete_channel)
     
     @discord.ui.button(label="Cancel", style=discord.ButtonStyle.danger, emoji="<:Cross:1393269948700426341>")
     async def cancel_close(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -108,7 +148,9 @@ def setup(bot):
             await ctx.send("This command can only be used in ticket channels.")
             return
         
-        if not (ctx.channel.name == f"ticket-{ctx.author.name.lower()}" or has_staff_permissions(ctx.author)):
+        record = get_ticket(ctx.channel.id)
+        is_owner = record["owner_id"] == ctx.author.id if record else ctx.channel.name == f"ticket-{ctx.author.name.lower()}"
+        if not (is_owner or has_staff_permissions(ctx.author)):
             await ctx.send("You don't have permission to close this ticket.")
             return
         
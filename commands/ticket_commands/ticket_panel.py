@@ -1,7 +1,11 @@
 import discord
 from discord.ext import commands
 import config
-from utils.ticket_utils import create_ticket_channel
+from utils.ticket_queue import ticket_queue
+from utils.ticket_registry import get_open_ticket_channel
+from utils.ticket_assigner import ticket_assigner
+from utils.topic_updater import topic_updater
+from utils.interactions import defer_and_run
 # Import the blacklist function
 from commands.ticket_commands.ticket_blacklist import is_user_blacklisted
 
@@ -60,7 +64,7 @@ class TicketPanelView(discord.ui.View):
             return
 
         guild = interaction.guild
-        existing_ticket = discord.utils.get(guild.channels, name=f"ticket-{interaction.user.name.lower()}")
+        existing_ticket = get_open_ticket_channel(guild, interaction.user.id)
 
         if existing_ticket:
             embed = discord.Embed(
@@ -100,36 +104,64 @@ class TicketReasonModal(discord.ui.Modal, title='Create Support Ticket'):
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
 
-        ticket_channel = await create_ticket_channel(interaction.guild, interaction.user, self.reason.value)
+        # Acknowledge straight away, the channel is created by the per-guild queue and the result sent as a follow-up
+        await defer_and_run(interaction, lambda: self.create_ticket(interaction))
 
-        if ticket_channel:
-
-            success_embed = discord.Embed(
-                title="<:Tick:1393269945500045473> Ticket Created Successfully",
-                description=f"Your ticket has been created: {ticket_channel.mention}",
+    async def create_ticket(self, interaction: discord.Interaction):
+        """Queue the ticket channel, set it up once it exists, returns the embed to show the user"""
+        pending = ticket_queue.submit(interaction.guild, interaction.user, self.reason.value)
+        if pending is None:
+            return discord.Embed(
+                title="<:Warning:1393269985031487528> Ticket Already Being Created",
+                description="Your ticket is already being created, please wait a moment.",
                 color=0xFFFFFF
             )
-
-            await interaction.response.send_message(embed=success_embed, ephemeral=True)
-
-            support_role = interaction.guild.get_role(config.STAFF_ROLE_ID)
-            if support_role:
-                ping_message = await ticket_channel.send(f"{support_role.mention} - New ticket created!")
-                await ping_message.delete()
-
+        
+        try:
+            ticket_channel, created = await pending
+        except Exception as e:
+            print(f"Error creating ticket channel: {e}")
+            ticket_channel, created = None, True
+        
+        if ticket_channel and not created:
             embed = discord.Embed(
-                title="<:Team:1393269975753691276> Support Ticket",
-                description=f"**Created by:** {interaction.user.mention}\n**Reason:** {self.reason.value}\n\nA staff member will be with you shortly.",
+                title="<:Warning:1393269985031487528> Ticket Already Exists",
+                description=f"You already have an open ticket: {ticket_channel.mention}",
                 color=0xFFFFFF
             )
-            
             embed.set_image(url="https://media.discordapp.net/attachments/1393317286248448200/1393317450367369277/image.png?ex=6872bb7e&is=687169fe&hm=679a83259dbb1029cd71ad93e4b74d7979a48365ec7969cebeacfd9905a1d3b4&=&format=webp&quality=lossless")
-            await ticket_channel.send(embed=embed)
-        else:
-            
-            error_embed = discord.Embed(
+            return embed
+
+        if not ticket_channel:
+            return discord.Embed(
                 title="<:Cross:1393269948700426341> Ticket Creation Failed",
                 description="Failed to create ticket. Please contact the Network Administrator.",
                 color=0xFFFFFF
             )
-            await interaction.response.send_message(embed=error_embed, ephemeral=True)
\ No newline at end of file
+
+        support_role = interaction.guild.get_role(config.STAFF_ROLE_ID)
+        if support_role:
+            ping_message = await ticket_channel.send(f"{support_role.mention} - New ticket created!")
+            await ping_message.delete()
+
+        embed = discord.Embed(
+            title="<:Team:1393269975753691276> Support Ticket",
+            description=f"**Created by:** {interaction.user.mention}\n**Reason:** {self.reason.value}\n\nA staff member will be with you shortly.",
+            color=0xFFFFFF
+        )
+        
+        embed.set_image(url="https://media.discordapp.net/attachments/1393317286248448200/1393317450367369277/image.png?ex=6872bb7e&is=687169fe&hm=679a83259dbb1029cd71ad93e4b74d7979a48365ec7969cebeacfd9905a1d3b4&=&format=webp&quality=lossless")
+        await ticket_channel.send(embed=embed)
+        
+        # Hand the ticket to whoever has the fewest open claims
+        if config.TICKET_AUTO_ASSIGN:
+            assignee = await ticket_assigner.assign(ticket_channel)
+            if assignee:
+                topic_updater.schedule(ticket_channel)
+                await ticket_channel.send(f"This ticket has been assigned to {assignee.mention}.")
+
+        return discord.Embed(
+            title="<:Tick:1393269945500045473> Ticket Created Successfully",
+            description=f"Your ticket has been created: {ticket_channel.mention}",
+            color=0xFFFFFF
+        )
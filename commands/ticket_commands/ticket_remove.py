@@ -3,6 +3,7 @@ import discord
 from discord.ext import commands
 import config
 from utils.ticket_utils import is_ticket_channel, has_staff_permissions
+from utils.ticket_registry import get_ticket, update_ticket
 
 def setup(bot):
     @bot.command(name='remove')
@@ -17,9 +18,17 @@ def setup(bot):
             await ctx.send("Only staff members can remove users from tickets.")
             return
         
+        record = get_ticket(ctx.channel.id)
+        if record is not None and record["owner_id"] == member.id:
+            await ctx.send("You can't remove the ticket owner from their own ticket.")
+            return
+        
         # Remove user from channel
         await ctx.channel.set_permissions(member, overwrite=None)
         
+        if record is not None and member.id in record["member_ids"]:
+            await update_ticket(ctx.channel.id, {"member_ids": [member_id for member_id in record["member_ids"] if member_id != member.id]})
+        
         embed = discord.Embed(
             title="<:Cross:1393269948700426341> User Removed",
             description=f"{member.mention} has been removed from this ticket.",
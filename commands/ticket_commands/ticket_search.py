@@ -0,0 +1,59 @@
+import discord
+import os
+from datetime import datetime
+from discord.ext import commands
+from utils.ticket_utils import has_staff_permissions
+from utils.transcript_archive import get_transcript_archive
+from utils.storage import run_io
+
+def setup(bot):
+    @bot.command(name='ticketsearch')
+    async def ticket_search(ctx, *, terms: str = None):
+        """Search archived ticket transcripts (message text, user IDs, reasons)"""
+        if not has_staff_permissions(ctx.author):
+            await ctx.send("Only staff members can search ticket transcripts.")
+            return
+        
+        if not terms:
+            await ctx.send("**Usage:** `!ticketsearch <terms>`")
+            return
+        
+        results, total = await run_io(get_transcript_archive().search, ctx.guild.id, terms)
+        
+        embed = discord.Embed(
+            title="<:Info:1393269947005780069> Ticket Search",
+            description=f"{total} archived ticket(s) match `{terms}`",
+            color=0xFFFFFF,
+            timestamp=discord.utils.utcnow()
+        )
+        for ticket in results:
+            closed_at = datetime.fromisoformat(ticket["closed_at"])
+            owner = f"<@{ticket['owner_id']}>" if ticket["owner_id"] else "Unknown"
+            embed.add_field(
+                name=f"Archive #{ticket['ticket_id']} - {ticket['channel_name']}",
+                value=f"**Owner:** {owner}\n**Closed:** <t:{int(closed_at.timestamp())}:R> by <@{ticket['closed_by_id']}>\n**Reason:** {ticket['reason']}",
+                inline=False
+            )
+        if total > len(results):
+            embed.set_footer(text=f"Showing the {len(results)} most recent - add more terms to narrow it down")
+        elif results:
+            embed.set_footer(text="Use !tickettranscript <archive #> to get a transcript")
+        embed.set_image(url="https://media.discordapp.net/attachments/1393317286248448200/1393317450367369277/image.png?ex=6872bb7e&is=687169fe&hm=679a83259dbb1029cd71ad93e4b74d7979a48365ec7969cebeacfd9905a1d3b4&=&format=webp&quality=lossless")
+        
+        await ctx.send(embed=embed)
+    
+    @bot.command(name='tickettranscript')
+    async def ticket_transcript(ctx, archive_id: int):
+        """Get the transcript of an archived ticket"""
+        if not has_staff_permissions(ctx.author):
+            await ctx.send("Only staff members can view archived transcripts.")
+            return
+        
+        archive = get_transcript_archive()
+        ticket = await run_io(archive.get_ticket, ctx.guild.id, archive_id)
+        path = archive.blob_path(ticket["blob"]) if ticket else None
+        if not path or not os.path.exists(path):
+            await ctx.send(f"No archived transcript found with ID {archive_id}.")
+            return
+        
+        await ctx.send(f"Transcript for Archive #{archive_id} ({ticket['channel_name']})", file=discord.File(path, filename=ticket["filename"]))
@@ -0,0 +1,50 @@
+import discord
+from discord.ext import commands
+from utils.ticket_utils import has_staff_permissions
+from utils.ticket_metrics import METRICS, RETENTION_DAYS, get_percentiles
+
+def format_duration(seconds):
+    """Format a duration like 2d 4h, 3h 12m or 45s"""
+    seconds = int(seconds)
+    days, seconds = divmod(seconds, 86400)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    if days:
+        return f"{days}d {hours}h"
+    if hours:
+        return f"{hours}h {minutes}m"
+    if minutes:
+        return f"{minutes}m {seconds}s"
+    return f"{seconds}s"
+
+def setup(bot):
+    @bot.command(name='ticketstats')
+    async def ticket_stats(ctx, days: int = 30):
+        """Show ticket response, claim and close time percentiles over the last N days"""
+        if not has_staff_permissions(ctx.author):
+            await ctx.send("Only staff members can view ticket statistics.")
+            return
+        
+        if days < 1:
+            await ctx.send("Please provide a number of days of at least 1.")
+            return
+        # Older days have already been dropped, and a huge value would overflow the date cutoff
+        days = min(days, RETENTION_DAYS)
+        
+        embed = discord.Embed(
+            title=f"<:Info:1393269947005780069> Ticket Statistics (last {days} days)",
+            color=0xFFFFFF,
+            timestamp=discord.utils.utcnow()
+        )
+        for metric, label in METRICS.items():
+            count, percentiles = get_percentiles(ctx.guild.id, metric, days)
+            if not count:
+                value = "No data yet"
+            else:
+                value = " | ".join(f"**p{q}:** {format_duration(seconds)}" for q, seconds in percentiles.items())
+                value += f"\n{count} ticket(s)"
+            embed.add_field(name=label, value=value, inline=False)
+        embed.set_footer(text="Percentiles are accurate to about 5%")
+        embed.set_image(url="https://media.discordapp.net/attachments/1393317286248448200/1393317450367369277/image.png?ex=6872bb7e&is=687169fe&hm=679a83259dbb1029cd71ad93e4b74d7979a48365ec7969cebeacfd9905a1d3b4&=&format=webp&quality=lossless")
+        
+        await ctx.send(embed=embed)
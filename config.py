@@ -15,5 +15,10 @@ SHIFT_CHANNEL_ID = int(os.getenv("SHIFT_CHANNEL_ID"))
 TRAINING_CHANNEL_ID = int(os.getenv("TRAINING_CHANNEL_ID"))
 MODERATION_ROLE_ID = int(os.getenv("MODERATION_ROLE_ID"))
 MODERARION_CHANNEL_ID = int(os.getenv("MODERARION_CHANNEL_ID"))
+MODERATION_CHANNEL_ID = MODERARION_CHANNEL_ID  # Correctly spelled name used by the moderation commands
 ROBLOX_GROUP_ID = int(os.getenv("ROBLOX_GROUP_ID"))
-GROUP_COUNTER_CHANNEL_ID = int(os.getenv("GROUP_COUNTER_CHANNEL_ID"))
\ No newline at end of file
+GROUP_COUNTER_CHANNEL_ID = int(os.getenv("GROUP_COUNTER_CHANNEL_ID"))
+TRANSCRIPT_FORMAT = os.getenv("TRANSCRIPT_FORMAT", "text")  # "text" or "html"
+TRANSCRIPT_GZIP = os.getenv("TRANSCRIPT_GZIP", "false").lower() == "true"
+TICKET_IDLE_HOURS = float(os.getenv("TICKET_IDLE_HOURS", "0"))  # Auto-close tickets idle this long, 0 (default) leaves them open
+TICKET_AUTO_ASSIGN = os.getenv("TICKET_AUTO_ASSIGN", "false").lower() == "true"  # Needs the presence intent
@@ -10,6 +10,8 @@ from commands.ticket_commands.ticket_panel import setup as setup_ticket_panel
 from commands.ticket_commands.ticket_claim import setup as setup_ticket_claim
 from commands.ticket_commands.ticket_blacklist import setup as setup_ticket_blacklist
 from commands.ticket_commands.patience import setup as setup_patience
+from commands.ticket_commands.ticket_search import setup as setup_ticket_search
+from commands.ticket_commands.ticket_stats import setup as setup_ticket_stats
 
 # Shift commands imports
 from commands.shift_commands.shift_start import setup as setup_shift_start
@@ -42,15 +44,28 @@ from commands.moderation_commands.members import setup as setup_members
 # Import views and utilities
 from commands.ticket_commands.ticket_panel import TicketPanelView
 from utils.reaction_panel import GeneralRolesView, PronounsRolesView
+from utils.moderation_pages import ModerationPageButton
 from utils.invite_utils import setup_invite_tracking, handle_member_join, cache_invites_for_guild, setup_invite_commands
 from utils.group_counter import setup_group_monitoring
+from utils.case_store import get_case_store
+from utils.transcript_capture import setup_transcript_capture, load_captured_channels
+from utils.ticket_registry import setup_ticket_registry, index_open_tickets
+from utils.ticket_utils import setup_ticket_categories, index_ticket_categories, get_ticket_channels
+from utils.ticket_sweeper import inactivity_sweeper, setup_inactivity_sweeper
+from utils.ticket_metrics import setup_ticket_metrics
+from utils.ticket_assigner import ticket_assigner, setup_ticket_assigner
+from utils.write_behind import start_flusher, flush_all
+from utils.mute_scheduler import mute_scheduler
+from utils.storage import run_io
 import asyncio
+import atexit
 
 intents = discord.Intents.default()
 intents.message_content = True
 intents.guilds = True
 intents.members = True
 intents.invites = True  # Required for invite tracking
+intents.presences = config.TICKET_AUTO_ASSIGN  # Auto-assign only picks online staff
 
 bot = commands.Bot(command_prefix='!', intents=intents)
 
@@ -63,6 +78,33 @@ async def on_ready():
     bot.add_view(TicketPanelView())
     bot.add_view(GeneralRolesView())
     bot.add_view(PronounsRolesView())
+    bot.add_dynamic_items(ModerationPageButton)
+    
+    # Load the moderation case store and start flushing changes in the background
+    await run_io(get_case_store)
+    start_flusher()
+    print('Write-behind storage started')
+    
+    # Start marking timed mutes inactive as they expire
+    mute_scheduler.start(bot)
+    print('Mute expiry scheduler started')
+    
+    # Index the ticket categories and who already has an open ticket, dropping tickets deleted while offline
+    for guild in bot.guilds:
+        index_ticket_categories(guild)
+        await index_open_tickets(guild, get_ticket_channels(guild))
+    load_captured_channels(bot)
+    print('Ticket categories and open ticket index built')
+    
+    # Track online staff and their ticket loads for auto-assignment
+    if config.TICKET_AUTO_ASSIGN:
+        for guild in bot.guilds:
+            ticket_assigner.load(guild)
+        print('Ticket auto-assignment enabled')
+    
+    # Start closing tickets that have gone quiet
+    inactivity_sweeper.start(bot)
+    print('Inactivity sweeper started')
     
     # Update presence
     await bot.change_presence(activity=discord.CustomActivity(name="Indexing tickets"))
@@ -151,6 +193,14 @@ safe_setup(setup_ticket_panel, "ticket_panel")
 safe_setup(setup_ticket_claim, "ticket_claim")
 safe_setup(setup_ticket_blacklist, "ticket_blacklist")
 safe_setup(setup_patience, "patience")
+safe_setup(setup_ticket_search, "ticket_search")
+safe_setup(setup_ticket_stats, "ticket_stats")
+safe_setup(setup_transcript_capture, "transcript_capture")
+safe_setup(setup_ticket_registry, "ticket_registry")
+safe_setup(setup_ticket_categories, "ticket_categories")
+safe_setup(setup_inactivity_sweeper, "inactivity_sweeper")
+safe_setup(setup_ticket_metrics, "ticket_metrics")
+safe_setup(setup_ticket_assigner, "ticket_assigner")
 
 # Setup shift commands
 safe_setup(setup_shift_start, "shift_start")
@@ -187,4 +237,6 @@ safe_setup(setup_members, "members")
 print("Command loading complete!")
 
 if __name__ == "__main__":
+    # Write out any changes still held in memory when the bot stops
+    atexit.register(flush_all)
     bot.run(config.DISCORD_TOKEN)
\ No newline at end of file
@@ -0,0 +1,124 @@
+import asyncio
+import time
+import discord
+
+# How many sends run at once; discord.py still queues each one behind its route's rate limit bucket
+BROADCAST_CONCURRENCY = 5
+# Minimum seconds between progress edits of the status message
+PROGRESS_INTERVAL = 2.0
+# How many times a rate-limited send is retried before it counts as failed
+MAX_RETRIES = 3
+
+class BroadcastResult:
+    """Which targets a broadcast reached"""
+
+    def __init__(self, total):
+        self.total = total
+        self.delivered = []
+        self.failed = []
+        self.skipped = []
+
+    @property
+    def done(self):
+        return len(self.delivered) + len(self.failed) + len(self.skipped)
+
+    def summary(self):
+        return f"{len(self.delivered)} delivered, {len(self.failed)} failed, {len(self.skipped)} skipped"
+
+def _retry_after(error):
+    """Seconds to wait before retrying a rate-limited request"""
+    if isinstance(error, discord.RateLimited):
+        return error.retry_after
+    try:
+        return float(error.response.headers.get("Retry-After", 1.0))
+    except (AttributeError, TypeError, ValueError):
+        return 1.0
+
+def _is_global_limit(error):
+    """Whether a 429 applies to every request the bot makes rather than one route"""
+    if isinstance(error, discord.RateLimited):
+        return False  # Raised for a single route's bucket
+    headers = getattr(error.response, "headers", None) or {}
+    return headers.get("X-RateLimit-Global") == "true" or headers.get("X-RateLimit-Scope") == "global"
+
+async def broadcast(channels, send, status_message=None, label="Broadcast", concurrency=BROADCAST_CONCURRENCY):
+    """Run send(channel) for every channel with bounded concurrency
+
+    Channels the bot can't post in are skipped up front. A rate-limited send is retried
+    once its channel's limit resets; a global rate limit pauses every worker instead. When status_message is
+    given it is edited with progress and finally with the delivered/failed/skipped summary.
+    """
+    result = BroadcastResult(len(channels))
+    queue = asyncio.Queue()
+    for channel in channels:
+        permissions = channel.permissions_for(channel.guild.me)
+        if permissions.view_channel and permissions.send_messages:
+            queue.put_nowait(channel)
+        else:
+            result.skipped.append(channel)
+
+    resume_at = 0.0  # Monotonic time until which all workers hold off after a global 429
+
+    async def worker():
+        nonlocal resume_at
+        while True:
+            try:
+                channel = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            channel_resume_at = 0.0  # Sends to one channel share a route, so its limit only holds back this channel
+            for attempt in range(MAX_RETRIES + 1):
+                delay = max(resume_at, channel_resume_at) - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                try:
+                    await send(channel)
+                    result.delivered.append(channel)
+                    break
+                except (discord.Forbidden, discord.NotFound):
+                    result.skipped.append(channel)  # Permissions changed or the channel was deleted
+                    break
+                except (discord.RateLimited, discord.HTTPException) as e:
+                    # RateLimited isn't an HTTPException, discord.py raises it when a bucket's wait is too long
+                    if (isinstance(e, discord.RateLimited) or e.status == 429) and attempt < MAX_RETRIES:
+                        retry_at = time.monotonic() + _retry_after(e)
+                        if _is_global_limit(e):
+                            resume_at = max(resume_at, retry_at)
+                        else:
+                            channel_resume_at = retry_at
+                        continue
+                    print(f"{label} failed for {channel}: {e}")
+                    result.failed.append(channel)
+                    break
+
+    async def report_progress():
+        last_content = None
+        while True:
+            await asyncio.sleep(PROGRESS_INTERVAL)
+            content = f"{label}: {result.done}/{result.total} channels ({result.summary()})"
+            if content == last_content:
+                continue
+            try:
+                await status_message.edit(content=content)
+                last_content = content
+            except discord.HTTPException:
+                pass
+
+    reporter = asyncio.create_task(report_progress()) if status_message else None
+    try:
+        await asyncio.gather(*(worker() for _ in range(min(concurrency, max(queue.qsize(), 1)))))
+    finally:
+        if reporter:
+            reporter.cancel()
+
+    if status_message:
+        content = f"{label} complete: {result.summary()}."
+        try:
+            await status_message.edit(content=content)
+        except discord.HTTPException:
+            # The status message was deleted mid-broadcast, post the summary on its own instead
+            try:
+                await status_message.channel.send(content)
+            except discord.HTTPException:
+                pass
+    return result
@@ -0,0 +1,390 @@
+import bisect
+import heapq
+import json
+import os
+import sqlite3
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from utils.write_behind import WriteBehindStore, FLUSH_EVERY
+from utils.storage import file_lock, run_io
+
+DATA_DIR = "data"
+DB_PATH = os.path.join(DATA_DIR, "moderation.db")
+
+# Legacy per-command JSON files, imported into the case store on first start
+LEGACY_FILES = {
+    "warn": "warnings.json",
+    "unwarn": "unwarns.json",
+    "mute": "mutes.json",
+    "unmute": "unmutes.json",
+    "ban": "bans.json",
+    "unban": "unbans.json",
+    "kick": "kicks.json",
+    "note": "notes.json",
+    "lockdown": "lockdowns.json",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cases (
+    action TEXT NOT NULL,
+    case_id TEXT NOT NULL,
+    guild_id INTEGER,
+    user_id INTEGER,
+    moderator_id INTEGER,
+    channel_id INTEGER,
+    timestamp TEXT NOT NULL,
+    active INTEGER,
+    data TEXT NOT NULL,
+    PRIMARY KEY (action, case_id)
+);
+CREATE INDEX IF NOT EXISTS idx_cases_guild_user ON cases (guild_id, user_id);
+CREATE INDEX IF NOT EXISTS idx_cases_guild_moderator ON cases (guild_id, moderator_id);
+CREATE INDEX IF NOT EXISTS idx_cases_timestamp ON cases (timestamp);
+CREATE TABLE IF NOT EXISTS counters (
+    action TEXT PRIMARY KEY,
+    last_id INTEGER NOT NULL
+);
+"""
+
+
+class CaseStore(WriteBehindStore):
+    """In-memory moderation case store backed by an append-only journal and a SQLite snapshot
+
+    Every change is appended as one line to the current journal segment. Compaction
+    (the write-behind flush) starts a new segment, folds the dirty cases and ID
+    counters into SQLite, then deletes the segments it has folded. On startup the
+    snapshot is loaded and any remaining segments are replayed on top of it.
+    """
+
+    def __init__(self, path: str = DB_PATH, flush_every: int = FLUSH_EVERY):
+        super().__init__(path, flush_every)
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+        self.import_legacy_files()
+
+        # (action, case_id) -> record, loaded once and served from memory
+        self.cases: Dict[Tuple[str, str], Dict] = {}
+        self.last_ids: Dict[str, int] = dict(self.conn.execute("SELECT action, last_id FROM counters"))
+        for action, case_id, data in self.conn.execute("SELECT action, case_id, data FROM cases"):
+            self.cases[(action, case_id)] = json.loads(data)
+            self._track_id(action, case_id)
+
+        # (guild_id, user_id) -> action -> case IDs ordered oldest to newest
+        self.user_index: Dict[Tuple[int, int], Dict[str, List[str]]] = {}
+        # action -> (guild_id, channel_id) -> ID of the active case on that channel (e.g. a lockdown)
+        self.active_channel_cases: Dict[str, Dict[Tuple[int, int], str]] = {}
+        for key in sorted(self.cases, key=lambda key: self.cases[key]["timestamp"]):
+            self._index_add(key)
+
+        # Replay the journal tail written since the last compaction
+        self.journal_prefix = os.path.splitext(path)[0] + "-journal-"
+        segments = self._journal_segments()
+        replayed = set()
+        for number, segment_path in segments:
+            replayed |= self._replay_segment(segment_path)
+        if replayed:
+            self.dirty |= replayed
+            print(f"Replayed {len(replayed)} journaled moderation changes")
+        else:
+            for number, segment_path in segments:
+                os.remove(segment_path)
+        self._open_segment(segments[-1][0] + 1 if segments else 1)
+
+    @staticmethod
+    def _row_values(action: str, case_id: str, record: Dict) -> tuple:
+        """Build the column values for a case record"""
+        active = record.get("active")
+        return (
+            action,
+            case_id,
+            record.get("guild_id"),
+            record.get("user_id"),
+            record.get("moderator_id"),
+            record.get("channel_id"),
+            record["timestamp"],
+            None if active is None else int(bool(active)),
+            json.dumps(record),
+        )
+
+    def _track_id(self, action: str, case_id: str):
+        """Remember the highest numeric ID seen for an action type"""
+        if case_id.isdigit():
+            self.last_ids[action] = max(self.last_ids.get(action, 0), int(case_id))
+
+    def _journal_segments(self) -> List[Tuple[int, str]]:
+        """List (number, path) of journal segments on disk, oldest first"""
+        directory = os.path.dirname(self.journal_prefix) or "."
+        base = os.path.basename(self.journal_prefix)
+        segments = []
+        for name in os.listdir(directory):
+            number = name[len(base):-len(".jsonl")]
+            if name.startswith(base) and name.endswith(".jsonl") and number.isdigit():
+                segments.append((int(number), os.path.join(directory, name)))
+        return sorted(segments)
+
+    def _open_segment(self, number: int):
+        """Start appending to a journal segment"""
+        self.segment = number
+        self.journal = open(f"{self.journal_prefix}{number:06d}.jsonl", "a")
+
+    def _replay_segment(self, segment_path: str) -> set:
+        """Apply a journal segment to the in-memory cases, returns the keys it touched"""
+        touched = set()
+        with open(segment_path, "r") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final line from a crash mid-append
+                    print(f"Skipping corrupt journal line in {segment_path}")
+                    continue
+                touched.add(self._apply(entry))
+        return touched
+
+    def _index_add(self, key: Tuple[str, str]):
+        """Add a case to its user's index (keeping timestamp order) and the active channel index"""
+        action, case_id = key
+        record = self.cases[key]
+        self._index_channel(key)
+        if record.get("user_id") is None:
+            return
+        case_ids = self.user_index.setdefault((record.get("guild_id"), record["user_id"]), {}).setdefault(action, [])
+        bisect.insort(case_ids, case_id, key=lambda cid: self.cases[(action, cid)]["timestamp"])
+
+    def _index_remove(self, key: Tuple[str, str]):
+        """Remove a case from its user's index and the active channel index"""
+        action, case_id = key
+        record = self.cases[key]
+        channel_key = (record.get("guild_id"), record.get("channel_id"))
+        if self.active_channel_cases.get(action, {}).get(channel_key) == case_id:
+            del self.active_channel_cases[action][channel_key]
+        case_ids = self.user_index.get((record.get("guild_id"), record.get("user_id")), {}).get(action)
+        if case_ids and case_id in case_ids:
+            case_ids.remove(case_id)
+
+    def _index_channel(self, key: Tuple[str, str]):
+        """Keep the active channel index in step with a channel case's active flag"""
+        action, case_id = key
+        record = self.cases[key]
+        if record.get("channel_id") is None:
+            return
+        channel_key = (record.get("guild_id"), record["channel_id"])
+        active_cases = self.active_channel_cases.setdefault(action, {})
+        if record.get("active", True):
+            active_cases[channel_key] = case_id
+        elif active_cases.get(channel_key) == case_id:
+            del active_cases[channel_key]
+
+    def _apply(self, entry: Dict) -> Tuple[str, str]:
+        """Apply a single journal entry to the in-memory cases and their indexes"""
+        key = (entry["action"], entry["case_id"])
+        if entry["op"] == "add":
+            if key in self.cases:
+                self._index_remove(key)
+            self.cases[key] = entry["record"]
+            self._index_add(key)
+            self._track_id(*key)
+        elif entry["op"] == "update":
+            if key in self.cases:
+                self.cases[key].update(entry["changes"])
+                self._index_channel(key)
+        elif entry["op"] == "delete":
+            if key in self.cases:
+                self._index_remove(key)
+                del self.cases[key]
+        return key
+
+    def _append(self, line: str):
+        """Append one line to the journal (runs on the storage pool)"""
+        with self.lock:
+            self.journal.write(line)
+            self.journal.flush()
+
+    async def _commit(self, entry: Dict):
+        """Apply an entry in memory, then append it to the journal off the event loop"""
+        line = json.dumps(entry) + "\n"
+        with self.lock:
+            key = self._apply(entry)
+            self.mark_dirty(key)
+        await run_io(self._append, line)
+
+    def import_legacy_files(self, data_dir: str = DATA_DIR) -> int:
+        """Import the old data/*.json files if the case store is still empty"""
+        if self.conn.execute("SELECT 1 FROM cases LIMIT 1").fetchone():
+            return 0
+
+        rows = []
+        for action, filename in LEGACY_FILES.items():
+            path = os.path.join(data_dir, filename)
+            if not os.path.exists(path):
+                continue
+            try:
+                with open(path, "r") as f:
+                    records = json.load(f)
+            except (json.JSONDecodeError, OSError) as e:
+                print(f"Failed to import {path}: {e}")
+                continue
+            for case_id, record in records.items():
+                rows.append(self._row_values(action, str(case_id), record))
+
+        if rows:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO cases VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            counters = {}
+            for action, case_id in (row[:2] for row in rows):
+                if case_id.isdigit():
+                    counters[action] = max(counters.get(action, 0), int(case_id))
+            self.conn.executemany("INSERT OR REPLACE INTO counters VALUES (?, ?)", counters.items())
+            self.conn.commit()
+            print(f"Imported {len(rows)} legacy moderation records into {self.path}")
+        return len(rows)
+
+    def snapshot(self, keys):
+        records = {key: dict(self.cases[key]) if key in self.cases else None for key in keys}
+        counters = dict(self.last_ids)
+
+        # New changes go to a fresh segment while this one is folded into SQLite
+        self.journal.close()
+        folded_segment = self.segment
+        self._open_segment(self.segment + 1)
+        return records, counters, folded_segment
+
+    def write(self, keys, snapshot):
+        records, counters, folded_segment = snapshot
+        upserts = [self._row_values(action, case_id, record)
+                   for (action, case_id), record in records.items() if record is not None]
+        deletes = [key for key, record in records.items() if record is None]
+        with self.conn:
+            if upserts:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO cases VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", upserts
+                )
+            if deletes:
+                self.conn.executemany("DELETE FROM cases WHERE action = ? AND case_id = ?", deletes)
+            self.conn.executemany("INSERT OR REPLACE INTO counters VALUES (?, ?)", counters.items())
+
+        # Everything up to the folded segment is now in the snapshot
+        for number, segment_path in self._journal_segments():
+            if number <= folded_segment:
+                os.remove(segment_path)
+
+    async def add_case(self, action: str, record: Dict) -> str:
+        """Store a new case and return its ID"""
+        async with file_lock(self.journal_prefix):
+            case_id = str(self.last_ids.get(action, 0) + 1)
+            await self._commit({"op": "add", "action": action, "case_id": case_id, "record": record})
+            return case_id
+
+    def get_case(self, action: str, case_id: str) -> Optional[Dict]:
+        """Get a single case by ID"""
+        return self.cases.get((action, str(case_id)))
+
+    async def update_case(self, action: str, case_id: str, changes: Dict) -> Optional[Dict]:
+        """Merge changes into an existing case and return the updated record"""
+        key = (action, str(case_id))
+        async with file_lock(self.journal_prefix):
+            if key not in self.cases:
+                return None
+            await self._commit({"op": "update", "action": action, "case_id": key[1], "changes": changes})
+            return self.cases.get(key)
+
+    async def delete_case(self, action: str, case_id: str) -> bool:
+        """Delete a case, returns whether it existed"""
+        key = (action, str(case_id))
+        async with file_lock(self.journal_prefix):
+            if key not in self.cases:
+                return False
+            await self._commit({"op": "delete", "action": action, "case_id": key[1]})
+            return True
+
+    def get_user_cases(self, guild_id: int, user_id: int, action: str, active_only: bool = False) -> List[tuple]:
+        """Get (case_id, record) pairs for a user, newest first"""
+        case_ids = self.user_index.get((guild_id, user_id), {}).get(action, [])
+        results = []
+        for case_id in reversed(case_ids):
+            record = self.cases[(action, case_id)]
+            if not active_only or record.get("active", True):
+                results.append((case_id, record))
+        return results
+
+    def count_user_cases(self, guild_id: int, user_id: int, action: str) -> int:
+        """Count a user's cases of one action type"""
+        return len(self.user_index.get((guild_id, user_id), {}).get(action, ()))
+
+    def page_user_cases(self, guild_id: int, user_id: int, action: str, before: Optional[str] = None, limit: int = 10) -> Tuple[List[tuple], Optional[str]]:
+        """Get one page of a user's cases, newest first
+
+        `before` is the cursor returned by the previous page (the timestamp of its
+        oldest entry); only older cases are returned. Returns (page, next_cursor),
+        where next_cursor is None once the oldest case has been reached.
+        """
+        case_ids = self.user_index.get((guild_id, user_id), {}).get(action, [])
+        end = len(case_ids)
+        if before is not None:
+            end = bisect.bisect_left(case_ids, before, key=lambda cid: self.cases[(action, cid)]["timestamp"])
+        start = max(0, end - limit)
+        page = [(case_id, self.cases[(action, case_id)]) for case_id in reversed(case_ids[start:end])]
+        next_cursor = page[-1][1]["timestamp"] if page and start > 0 else None
+        return page, next_cursor
+
+    def _iter_user_action(self, guild_id: int, user_id: int, action: str, since: Optional[str], until: Optional[str]) -> Iterator[tuple]:
+        """Walk one action's index for a user newest first, within [since, until)"""
+        case_ids = self.user_index.get((guild_id, user_id), {}).get(action, [])
+        timestamp = lambda cid: self.cases[(action, cid)]["timestamp"]
+        start = bisect.bisect_left(case_ids, since, key=timestamp) if since is not None else 0
+        end = bisect.bisect_left(case_ids, until, key=timestamp) if until is not None else len(case_ids)
+        for i in range(end - 1, start - 1, -1):
+            case_id = case_ids[i]
+            yield action, case_id, self.cases[(action, case_id)]
+
+    def iter_user_timeline(self, guild_id: int, user_id: int, actions: Iterable[str], since: Optional[str] = None, until: Optional[str] = None) -> Iterator[tuple]:
+        """Stream a user's (action, case_id, record) triples across several action types, newest first
+
+        The per-type indexes are already sorted, so they are merged lazily rather than
+        collected and sorted. `since` is inclusive and `until` exclusive (ISO timestamps).
+        """
+        streams = [self._iter_user_action(guild_id, user_id, action, since, until) for action in actions]
+        return heapq.merge(*streams, key=lambda item: item[2]["timestamp"], reverse=True)
+
+    def get_active_channel_case(self, guild_id: int, channel_id: int, action: str) -> Optional[tuple]:
+        """Get the (case_id, record) of the active case on a channel, or None"""
+        case_id = self.active_channel_cases.get(action, {}).get((guild_id, channel_id))
+        if case_id is None:
+            return None
+        return case_id, self.cases[(action, case_id)]
+
+    def list_active_channel_cases(self, guild_id: int, action: str) -> List[tuple]:
+        """Get (case_id, record) pairs of every active case of one action type in a guild, oldest first"""
+        results = [
+            (case_id, self.cases[(action, case_id)])
+            for (case_guild_id, channel_id), case_id in self.active_channel_cases.get(action, {}).items()
+            if case_guild_id == guild_id
+        ]
+        results.sort(key=lambda item: item[1]["timestamp"])
+        return results
+
+    def close(self):
+        """Compact pending changes and close the journal and database"""
+        self.flush()
+        self.journal.close()
+        self.conn.close()
+
+
+# Global store instance, loaded on first use (main.py loads it at startup)
+_store = None
+
+def get_case_store() -> CaseStore:
+    """Get the shared case store, opening it on first use"""
+    global _store
+    if _store is None:
+        _store = CaseStore()
+    return _store
@@ -0,0 +1,40 @@
+import asyncio
+import discord
+
+# Background tasks started by defer_and_run, kept referenced so they aren't garbage collected mid-run
+_background_tasks = set()
+
+async def defer_and_run(interaction: discord.Interaction, work, ephemeral: bool = True, thinking: bool = True, after=None):
+    """Acknowledge an interaction right away, then do the slow part in a tracked background task
+
+    work is a coroutine function whose return value is sent as a follow-up: a dict of
+    followup.send keyword arguments, an embed, a string, or None to send nothing. If it
+    raises, the user gets an error follow-up instead of "This interaction failed".
+    after, if given, is awaited once the follow-up has been sent, unless work failed.
+    """
+    if not interaction.response.is_done():
+        await interaction.response.defer(ephemeral=ephemeral, thinking=thinking)
+    task = asyncio.create_task(_run_deferred(interaction, work, ephemeral, after))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+async def _run_deferred(interaction, work, ephemeral, after):
+    try:
+        result = await work()
+    except Exception as e:
+        print(f"Error handling interaction {interaction.data.get('custom_id', interaction.type)}: {e}")
+        result = {"content": "<:Cross:1393269948700426341> Something went wrong, please try again or contact a staff member."}
+        after = None
+
+    try:
+        if isinstance(result, discord.Embed):
+            await interaction.followup.send(embed=result, ephemeral=ephemeral)
+        elif isinstance(result, str):
+            await interaction.followup.send(result, ephemeral=ephemeral)
+        elif result is not None:
+            await interaction.followup.send(ephemeral=ephemeral, **result)
+        if after is not None:
+            await after()
+    except Exception as e:
+        print(f"Error sending interaction follow-up: {e}")
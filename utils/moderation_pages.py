@@ -0,0 +1,178 @@
+import itertools
+import discord
+import config
+from utils.case_store import get_case_store
+
+PAGE_SIZE = 10
+
+# Action types shown in !modlogs, with the label and emoji used for each
+MODLOG_ACTIONS = {
+    "ban": ("Bans", "🔨 **Ban**"),
+    "kick": ("Kicks", "👢 **Kick**"),
+    "mute": ("Mutes", "🔇 **Mute**"),
+    "warn": ("Warnings", "⚠️ **Warning**"),
+}
+
+def add_chunked_fields(embed, name, entries):
+    """Add entries to an embed, splitting across up to 3 fields to stay under the 1024 character limit"""
+    content = "\n".join(entries)
+    if len(content) <= 1024:
+        embed.add_field(name=name, value=content, inline=False)
+        return
+
+    chunks = []
+    current_chunk = ""
+    for entry in entries:
+        if len(current_chunk + entry) > 1024:
+            chunks.append(current_chunk)
+            current_chunk = entry[:1024]
+        else:
+            current_chunk += entry + "\n"
+    if current_chunk:
+        chunks.append(current_chunk)
+
+    for i, chunk in enumerate(chunks[:3]):  # Limit to 3 fields
+        field_name = name if i == 0 else f"{name} (continued {i+1})"
+        embed.add_field(name=field_name, value=chunk, inline=False)
+
+def page_modlogs(guild_id, user_id, before=None, limit=PAGE_SIZE):
+    """Get one page of a user's bans, kicks, mutes and warnings combined, newest first"""
+    timeline = get_case_store().iter_user_timeline(guild_id, user_id, MODLOG_ACTIONS, until=before)
+    # Take one extra entry to find out whether there is an older page
+    page = list(itertools.islice(timeline, limit + 1))
+    has_more = len(page) > limit
+    page = page[:limit]
+    next_cursor = page[-1][2]["timestamp"] if page and has_more else None
+    return page, next_cursor
+
+def build_page(kind, guild, user_id, user=None, before=None):
+    """Build the embed and pagination buttons for one page of !warnings, !notes or !modlogs"""
+    store = get_case_store()
+    display_name = user.display_name if user else f"User {user_id}"
+
+    if kind == "warnings":
+        total = store.count_user_cases(guild.id, user_id, "warn")
+        page, next_cursor = store.page_user_cases(guild.id, user_id, "warn", before=before, limit=PAGE_SIZE)
+        if not total:
+            embed = discord.Embed(
+                title="<:Info:1393269947005780069> No Warnings Found",
+                description=f"No warnings found for <@{user_id}>",
+                color=0xFFFFFF,
+                timestamp=discord.utils.utcnow()
+            )
+            embed.set_image(url="https://media.discordapp.net/attachments/1393317286248448200/1393317450367369277/image.png?ex=6872bb7e&is=687169fe&hm=679a83259dbb1029cd71ad93e4b74d7979a48365ec7969cebeacfd9905a1d3b4&=&format=webp&quality=lossless")
+            return embed, None
+
+        embed = discord.Embed(
+            title=f"<:Warning:1393269950188048464> Warnings for {display_name}",
+            color=0xFFFFFF,
+            timestamp=discord.utils.utcnow()
+        )
+        embed.add_field(name="Total Warnings", value=str(total), inline=True)
+        entries = []
+        for warning_id, warning in page:
+            warning_text = f"**Warning #{warning_id}** ({warning['timestamp'][:10]})\n"
+            warning_text += f"By: {warning['moderator_name']}\n"
+            warning_text += f"Reason: {warning['reason']}\n"
+            entries.append(warning_text)
+        field_name = "Warnings"
+
+    elif kind == "notes":
+        total = store.count_user_cases(guild.id, user_id, "note")
+        page, next_cursor = store.page_user_cases(guild.id, user_id, "note", before=before, limit=PAGE_SIZE)
+        if not total:
+            embed = discord.Embed(
+                title="<:Info:1393269947005780069> No Notes Found",
+                description=f"No notes found for <@{user_id}>",
+                color=0xFFFFFF,
+                timestamp=discord.utils.utcnow()
+            )
+            embed.set_image(url="https://media.discordapp.net/attachments/1393317286248448200/1393317450367369277/image.png?ex=6872bb7e&is=687169fe&hm=679a83259dbb1029cd71ad93e4b74d7979a48365ec7969cebeacfd9905a1d3b4&=&format=webp&quality=lossless")
+            return embed, None
+
+        embed = discord.Embed(
+            title=f"<:Info:1393269947005780069> Notes for {display_name}",
+            color=0xFFFFFF,
+            timestamp=discord.utils.utcnow()
+        )
+        embed.add_field(name="Total Notes", value=str(total), inline=True)
+        entries = []
+        for note_id, note in page:
+            note_text = f"**Note #{note_id}** ({note['timestamp'][:10]})\n"
+            note_text += f"By: {note['moderator_name']}\n"
+            note_text += f"Note: {note['note']}\n"
+            entries.append(note_text)
+        field_name = "Notes"
+
+    else:
+        counts = {action: store.count_user_cases(guild.id, user_id, action) for action in MODLOG_ACTIONS}
+        total = sum(counts.values())
+        page, next_cursor = page_modlogs(guild.id, user_id, before=before)
+
+        embed = discord.Embed(
+            title=f"<:Info:1393269947005780069> Moderation Logs for {display_name}",
+            color=0xFFFFFF,
+            timestamp=discord.utils.utcnow()
+        )
+        for action, (label, _) in MODLOG_ACTIONS.items():
+            embed.add_field(name=label, value=str(counts[action]), inline=True)
+        embed.add_field(name="Total Actions", value=str(total), inline=True)
+        entries = [
+            f"{MODLOG_ACTIONS[action][1]} - {record['reason']} ({record['timestamp'][:10]})"
+            for action, case_id, record in page
+        ]
+        field_name = "Recent Actions" if before is None else "Older Actions"
+
+    if user:
+        embed.set_thumbnail(url=user.display_avatar.url)
+    embed.add_field(name="User ID", value=user_id, inline=True)
+    if kind != "modlogs":
+        embed.add_field(name="User", value=f"<@{user_id}>", inline=True)
+
+    if entries:
+        add_chunked_fields(embed, field_name, entries)
+    else:
+        embed.add_field(name=field_name, value="No moderation actions found.", inline=False)
+
+    embed.set_footer(text=f"{len(page)} shown of {total} total" + (" - press Older for more" if next_cursor else ""))
+    embed.set_image(url="https://media.discordapp.net/attachments/1393317286248448200/1393317450367369277/image.png?ex=6872bb7e&is=687169fe&hm=679a83259dbb1029cd71ad93e4b74d7979a48365ec7969cebeacfd9905a1d3b4&=&format=webp&quality=lossless")
+
+    # Only add buttons when there is somewhere to go
+    if before is None and next_cursor is None:
+        return embed, None
+    view = discord.ui.View(timeout=None)
+    view.add_item(ModerationPageButton(kind, user_id, "latest", label="Newest", disabled=before is None))
+    view.add_item(ModerationPageButton(kind, user_id, next_cursor or "end", label="Older", disabled=next_cursor is None))
+    return embed, view
+
+class ModerationPageButton(discord.ui.DynamicItem[discord.ui.Button], template=r"modpage:(?P<kind>warnings|notes|modlogs):(?P<user_id>\d+):(?P<cursor>.+)"):
+    """Persistent page button, the page cursor lives in the custom_id so it keeps working after restarts"""
+
+    def __init__(self, kind, user_id, cursor, label="Older", disabled=False):
+        super().__init__(
+            discord.ui.Button(
+                label=label,
+                style=discord.ButtonStyle.secondary,
+                custom_id=f"modpage:{kind}:{user_id}:{cursor}",
+                disabled=disabled
+            )
+        )
+        self.kind = kind
+        self.user_id = user_id
+        self.cursor = cursor
+
+    @classmethod
+    async def from_custom_id(cls, interaction, item, match):
+        return cls(match["kind"], int(match["user_id"]), match["cursor"])
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if not any(role.id == config.MODERATION_ROLE_ID for role in interaction.user.roles):
+            await interaction.response.send_message("You don't have permission to use this command.", ephemeral=True)
+            return False
+        return True
+
+    async def callback(self, interaction: discord.Interaction):
+        before = None if self.cursor == "latest" else self.cursor
+        user = interaction.guild.get_member(self.user_id) or interaction.client.get_user(self.user_id)
+        embed, view = build_page(self.kind, interaction.guild, self.user_id, user=user, before=before)
+        await interaction.response.edit_message(embed=embed, view=view)
@@ -0,0 +1,117 @@
+import asyncio
+import heapq
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Set, Tuple
+import discord
+import config
+from utils.case_store import get_case_store
+
+class MuteExpiryScheduler:
+    """Marks timed mutes inactive when they expire and keeps an index of active mutes"""
+
+    def __init__(self, announce: bool = True):
+        self.announce = announce
+        self.bot = None
+        self.heap: List[Tuple[datetime, str]] = []  # (expires_at, mute_id), earliest first
+        self.active: Dict[Tuple[int, int], Set[str]] = {}  # (guild_id, user_id) -> active mute IDs
+        self.wake: Optional[asyncio.Event] = None
+        self.task: Optional[asyncio.Task] = None
+
+    def load(self):
+        """Index every active mute in the case store"""
+        store = get_case_store()
+        self.heap = []
+        self.active = {}
+        for (action, mute_id), record in store.cases.items():
+            if action == "mute" and record.get("active", True):
+                self.track(mute_id, record)
+
+    def track(self, mute_id: str, record: dict):
+        """Start tracking a new active mute"""
+        self.active.setdefault((record["guild_id"], record["user_id"]), set()).add(mute_id)
+        if record.get("expires_at"):
+            expires_at = datetime.fromisoformat(record["expires_at"])
+            # Only wake the loop if this mute expires before everything already queued
+            if not self.heap or expires_at < self.heap[0][0]:
+                self._wake()
+            heapq.heappush(self.heap, (expires_at, mute_id))
+
+    def untrack(self, mute_id: str, record: dict):
+        """Stop tracking a mute (its heap entry is skipped when it comes up)"""
+        key = (record["guild_id"], record["user_id"])
+        mute_ids = self.active.get(key)
+        if mute_ids is not None:
+            mute_ids.discard(mute_id)
+            if not mute_ids:
+                del self.active[key]
+
+    def active_mute_ids(self, guild_id: int, user_id: int) -> List[str]:
+        """Get the IDs of a user's active mutes"""
+        return list(self.active.get((guild_id, user_id), ()))
+
+    def _wake(self):
+        if self.wake is not None:
+            self.wake.set()
+
+    async def expire(self, mute_id: str):
+        """Mark one mute as expired and log it"""
+        store = get_case_store()
+        record = store.get_case("mute", mute_id)
+        if record is None or not record.get("active", True):
+            return
+
+        record = await store.update_case("mute", mute_id, {
+            "active": False,
+            "expired_at": datetime.now(timezone.utc).isoformat()
+        })
+        self.untrack(mute_id, record)
+
+        if not self.announce:
+            return
+        mod_channel = self.bot.get_channel(config.MODERATION_CHANNEL_ID)
+        if mod_channel:
+            log_embed = discord.Embed(
+                title="<:Tick:1393269945500045473> Mute Expired",
+                color=0xFFFFFF,
+                timestamp=discord.utils.utcnow()
+            )
+            log_embed.add_field(name="User", value=f"<@{record['user_id']}> ({record['user_name']})", inline=True)
+            log_embed.add_field(name="User ID", value=record["user_id"], inline=True)
+            log_embed.add_field(name="Mute ID", value=mute_id, inline=True)
+            log_embed.add_field(name="Reason", value=record["reason"], inline=False)
+            await mod_channel.send(embed=log_embed)
+
+    async def run(self):
+        """Sleep until the next expiry, fire it, repeat"""
+        while True:
+            self.wake.clear()
+            timeout = None
+            if self.heap:
+                timeout = max(0, (self.heap[0][0] - datetime.now(timezone.utc)).total_seconds())
+            if timeout is None or timeout > 0:
+                try:
+                    await asyncio.wait_for(self.wake.wait(), timeout=timeout)
+                    continue  # Something earlier was scheduled, recompute the deadline
+                except asyncio.TimeoutError:
+                    pass
+
+            now = datetime.now(timezone.utc)
+            while self.heap and self.heap[0][0] <= now:
+                expires_at, mute_id = heapq.heappop(self.heap)
+                try:
+                    await self.expire(mute_id)
+                except Exception as e:
+                    print(f"Error expiring mute {mute_id}: {e}")
+
+    def start(self, bot):
+        """Load the active mutes and start the expiry loop, safe to call on every on_ready"""
+        if self.task is not None and not self.task.done():
+            return
+        self.bot = bot
+        self.wake = asyncio.Event()
+        self.load()
+        self.task = asyncio.create_task(self.run())
+
+
+# Global scheduler instance, started from on_ready
+mute_scheduler = MuteExpiryScheduler()
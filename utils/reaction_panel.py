@@ -1,5 +1,6 @@
 import discord
 import config
+from utils.interactions import defer_and_run
 
 # Configure your general roles here
 GENERAL_ROLES = [
@@ -108,7 +109,11 @@ class ReactionRoleButton(discord.ui.Button):
             )
             return
 
-        member = interaction.user
+        # Role edits can be slow under load, so acknowledge first and report back by follow-up
+        await defer_and_run(interaction, lambda: self.toggle_role(interaction.user, role))
+
+    async def toggle_role(self, member, role):
+        """Add or remove the role, returns the embed to show the member"""
         
         if role in member.roles:
             # Remove role
@@ -127,4 +132,4 @@ class ReactionRoleButton(discord.ui.Button):
                 color=0xFFFFFF
             )
         
-        await interaction.response.send_message(embed=embed, ephemeral=True)
\ No newline at end of file
+        return embed
\ No newline at end of file
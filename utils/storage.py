@@ -0,0 +1,22 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+
+# Small, bounded pool so a slow disk can't pile up unlimited threads
+STORAGE_WORKERS = 4
+
+_executor = ThreadPoolExecutor(max_workers=STORAGE_WORKERS, thread_name_prefix="storage")
+_locks: Dict[str, asyncio.Lock] = {}
+
+def file_lock(path: str) -> asyncio.Lock:
+    """Get the asyncio lock guarding a file, so read-modify-write sequences don't interleave"""
+    lock = _locks.get(path)
+    if lock is None:
+        lock = _locks[path] = asyncio.Lock()
+    return lock
+
+async def run_io(func, *args, **kwargs):
+    """Run blocking file I/O on the storage thread pool instead of the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(func, *args, **kwargs))
@@ -0,0 +1,115 @@
+import heapq
+from typing import Dict, List, Optional, Set, Tuple
+import discord
+import config
+from utils.ticket_registry import registry_store, update_ticket
+from utils.ticket_utils import has_staff_permissions
+
+class TicketAssigner:
+    """Hands new tickets to the online staff member with the fewest claimed tickets
+
+    Each guild has a min-heap of (open claimed tickets, staff_id). Entries go stale when
+    a load changes or someone goes offline; stale entries are dropped as they reach the
+    top, so an assignment costs O(log n) amortised.
+    """
+
+    def __init__(self):
+        self.heaps: Dict[int, List[Tuple[int, int]]] = {}
+        self.loads: Dict[int, Dict[int, int]] = {}  # guild_id -> staff_id -> open claimed tickets
+        self.online: Dict[int, Set[int]] = {}  # guild_id -> online staff IDs
+        self.claims: Dict[int, Tuple[int, int]] = {}  # channel_id -> (guild_id, staff_id)
+
+    def _push(self, guild_id: int, staff_id: int):
+        heapq.heappush(self.heaps.setdefault(guild_id, []), (self.loads[guild_id].get(staff_id, 0), staff_id))
+
+    def load(self, guild):
+        """Rebuild a guild's loads from the registry and its online staff from member presences"""
+        self.loads[guild.id] = {}
+        for record in registry_store.data["tickets"].values():
+            # A record can outlive its channel if the delete happened while the bot was offline
+            if record["guild_id"] != guild.id or guild.get_channel(record["channel_id"]) is None:
+                continue
+            if record.get("claimer_id"):
+                self.claims[record["channel_id"]] = (guild.id, record["claimer_id"])
+                loads = self.loads[guild.id]
+                loads[record["claimer_id"]] = loads.get(record["claimer_id"], 0) + 1
+        self.online[guild.id] = {
+            member.id for member in guild.members
+            if not member.bot and member.status != discord.Status.offline and has_staff_permissions(member)
+        }
+        self.heaps[guild.id] = [(self.loads[guild.id].get(staff_id, 0), staff_id) for staff_id in self.online[guild.id]]
+        heapq.heapify(self.heaps[guild.id])
+
+    def claimed(self, guild_id: int, staff_id: int, channel_id: int):
+        """Count a claimed ticket against a staff member"""
+        self.released(channel_id)
+        loads = self.loads.setdefault(guild_id, {})
+        loads[staff_id] = loads.get(staff_id, 0) + 1
+        self.claims[channel_id] = (guild_id, staff_id)
+        if staff_id in self.online.get(guild_id, ()):
+            self._push(guild_id, staff_id)
+
+    def released(self, channel_id: int):
+        """Stop counting a ticket that was unclaimed or closed"""
+        claim = self.claims.pop(channel_id, None)
+        if claim is None:
+            return
+        guild_id, staff_id = claim
+        loads = self.loads.get(guild_id, {})
+        if loads.get(staff_id):
+            loads[staff_id] -= 1
+        if staff_id in self.online.get(guild_id, ()):
+            self._push(guild_id, staff_id)
+
+    def set_online(self, member, online: bool):
+        """Track a staff member coming online or going offline"""
+        guild_online = self.online.setdefault(member.guild.id, set())
+        if online and member.id not in guild_online:
+            guild_online.add(member.id)
+            self.loads.setdefault(member.guild.id, {})
+            self._push(member.guild.id, member.id)
+        elif not online:
+            guild_online.discard(member.id)
+
+    def pick(self, guild) -> Optional[discord.Member]:
+        """Get the least-loaded online staff member, or None if nobody is online"""
+        heap = self.heaps.get(guild.id, [])
+        loads = self.loads.get(guild.id, {})
+        online = self.online.get(guild.id, set())
+        while heap:
+            load, staff_id = heap[0]
+            member = guild.get_member(staff_id)
+            if staff_id not in online or load != loads.get(staff_id, 0) or member is None:
+                heapq.heappop(heap)  # Stale entry
+                continue
+            return member
+        return None
+
+    async def assign(self, channel) -> Optional[discord.Member]:
+        """Assign a new ticket to the least-loaded online staff member, recorded as their claim"""
+        member = self.pick(channel.guild)
+        if member is None:
+            return None
+        await update_ticket(channel.id, {"claimer_id": member.id, "claimer_name": member.display_name, "auto_assigned": True})
+        self.claimed(channel.guild.id, member.id, channel.id)
+        return member
+
+
+# Global assigner instance, used when TICKET_AUTO_ASSIGN is on
+ticket_assigner = TicketAssigner()
+
+def setup_ticket_assigner(bot):
+    """Register the listeners that keep staff presence and ticket loads current"""
+    
+    async def release_deleted_ticket(channel):
+        ticket_assigner.released(channel.id)
+    
+    bot.add_listener(release_deleted_ticket, "on_guild_channel_delete")
+    if not getattr(config, "TICKET_AUTO_ASSIGN", False):
+        return
+    
+    async def track_presence(before, after):
+        if not after.bot and has_staff_permissions(after):
+            ticket_assigner.set_online(after, after.status != discord.Status.offline)
+    
+    bot.add_listener(track_presence, "on_presence_update")
@@ -0,0 +1,109 @@
+import math
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple
+from utils.write_behind import JsonStore
+from utils.storage import file_lock
+from utils.ticket_registry import get_ticket, update_ticket
+from utils.ticket_utils import is_ticket_channel, has_staff_permissions
+
+METRICS_FILE = "data/ticket_metrics.json"
+
+# Tracked durations, with the label used in !ticketstats
+METRICS = {
+    "first_response": "Time to First Staff Reply",
+    "claim": "Time to Claim",
+    "resolution": "Time to Close",
+}
+
+# Samples go into log-spaced buckets, each 10% wider than the last, so percentiles are
+# accurate to about 5% while only bucket counts are kept
+BUCKET_GROWTH = 1.1
+# Days of per-day histograms to keep
+RETENTION_DAYS = 365
+
+# guild_id -> day (YYYY-MM-DD) -> metric -> bucket index -> count
+metrics_store = JsonStore(METRICS_FILE)
+
+def bucket_index(seconds: float) -> int:
+    """Get the histogram bucket for a duration (bucket 0 holds everything under a second)"""
+    if seconds < 1:
+        return 0
+    return int(math.log(seconds) / math.log(BUCKET_GROWTH)) + 1
+
+def bucket_value(index: int) -> float:
+    """Get the duration a bucket stands for (the geometric middle of its range)"""
+    if index == 0:
+        return 0.0
+    return BUCKET_GROWTH ** (index - 0.5)
+
+async def record_metric(guild_id: int, metric: str, seconds: float):
+    """Add one sample to today's histogram for a metric"""
+    today = datetime.now(timezone.utc).date()
+    async with file_lock(METRICS_FILE):
+        guild_days = metrics_store.data.setdefault(str(guild_id), {})
+        buckets = guild_days.setdefault(today.isoformat(), {}).setdefault(metric, {})
+        index = str(bucket_index(max(0.0, seconds)))
+        buckets[index] = buckets.get(index, 0) + 1
+
+        # Drop days that have aged out
+        cutoff = (today - timedelta(days=RETENTION_DAYS)).isoformat()
+        for day in [day for day in guild_days if day < cutoff]:
+            del guild_days[day]
+        metrics_store.mark_dirty(str(guild_id))
+
+def get_percentiles(guild_id: int, metric: str, days: Optional[int] = None, quantiles=(50, 90, 99)) -> Tuple[int, Dict[int, float]]:
+    """Merge the daily histograms of the last `days` days (all if None), returns (sample count, {quantile: seconds})"""
+    cutoff = None
+    if days is not None:
+        cutoff = (datetime.now(timezone.utc).date() - timedelta(days=days - 1)).isoformat()
+    merged: Dict[int, int] = {}
+    for day, day_metrics in metrics_store.data.get(str(guild_id), {}).items():
+        if cutoff is not None and day < cutoff:
+            continue
+        for index, count in day_metrics.get(metric, {}).items():
+            merged[int(index)] = merged.get(int(index), 0) + count
+
+    total = sum(merged.values())
+    results = {}
+    if total:
+        running = 0
+        targets = sorted(quantiles)
+        for index in sorted(merged):
+            running += merged[index]
+            while targets and running >= math.ceil(total * targets[0] / 100):
+                results[targets.pop(0)] = bucket_value(index)
+    return total, results
+
+def _seconds_since(timestamp: str) -> float:
+    return (datetime.now(timezone.utc) - datetime.fromisoformat(timestamp)).total_seconds()
+
+async def record_claim(channel_id: int):
+    """Record a ticket's first claim"""
+    record = get_ticket(channel_id)
+    if record is None or record.get("claimed_at"):
+        return
+    await update_ticket(channel_id, {"claimed_at": datetime.now(timezone.utc).isoformat()})
+    await record_metric(record["guild_id"], "claim", _seconds_since(record["created_at"]))
+
+async def record_close(channel_id: int):
+    """Record how long a ticket was open"""
+    record = get_ticket(channel_id)
+    if record is None:
+        return
+    await record_metric(record["guild_id"], "resolution", _seconds_since(record["created_at"]))
+
+def setup_ticket_metrics(bot):
+    """Register the listener that records the first staff reply in each ticket"""
+    
+    async def track_first_response(message):
+        if message.author.bot or message.guild is None or not is_ticket_channel(message.channel):
+            return
+        record = get_ticket(message.channel.id)
+        if record is None or record.get("first_response_at") or record["owner_id"] == message.author.id:
+            return
+        if not has_staff_permissions(message.author):
+            return
+        await update_ticket(message.channel.id, {"first_response_at": datetime.now(timezone.utc).isoformat()})
+        await record_metric(record["guild_id"], "first_response", _seconds_since(record["created_at"]))
+    
+    bot.add_listener(track_first_response, "on_message")
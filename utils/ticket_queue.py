@@ -0,0 +1,60 @@
+import asyncio
+from typing import Dict, Set, Tuple
+from utils.ticket_utils import create_ticket_channel
+from utils.ticket_registry import get_open_ticket_channel
+
+# Seconds between channel creations in one guild, so a burst of submissions doesn't hit the channel create limit
+TICKET_CREATE_INTERVAL = 1.0
+
+class TicketCreationQueue:
+    """Creates ticket channels one at a time per guild, with at most one pending request per user"""
+
+    def __init__(self, interval: float = TICKET_CREATE_INTERVAL):
+        self.interval = interval
+        self.queues: Dict[int, asyncio.Queue] = {}
+        self.workers: Dict[int, asyncio.Task] = {}
+        self.in_flight: Set[Tuple[int, int]] = set()  # (guild_id, user_id) with a request queued or running
+
+    def submit(self, guild, user, reason):
+        """Queue a ticket for creation
+
+        Returns a future resolving to (channel, created), where created is False if the
+        user already had an open ticket, or None if this user already has a request queued.
+        """
+        key = (guild.id, user.id)
+        if key in self.in_flight:
+            return None
+        self.in_flight.add(key)
+
+        future = asyncio.get_running_loop().create_future()
+        queue = self.queues.setdefault(guild.id, asyncio.Queue())
+        queue.put_nowait((guild, user, reason, future))
+        worker = self.workers.get(guild.id)
+        if worker is None or worker.done():
+            self.workers[guild.id] = asyncio.create_task(self._run(queue))
+        return future
+
+    async def _run(self, queue: asyncio.Queue):
+        while True:
+            guild, user, reason, future = await queue.get()
+            try:
+                # The user may have got a ticket while this request was waiting
+                existing = get_open_ticket_channel(guild, user.id)
+                if existing:
+                    if not future.done():
+                        future.set_result((existing, False))
+                    continue
+                channel = await create_ticket_channel(guild, user, reason)
+                # The waiter may have given up (timed out or cancelled) while the channel was created
+                if not future.done():
+                    future.set_result((channel, True))
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                self.in_flight.discard((guild.id, user.id))
+            await asyncio.sleep(self.interval)
+
+
+# Global queue shared by every panel
+ticket_queue = TicketCreationQueue()
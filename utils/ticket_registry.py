@@ -0,0 +1,133 @@
+import discord
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from utils.write_behind import JsonStore
+from utils.storage import file_lock
+
+# Open tickets by channel ID, so commands never have to parse channel names or topics
+REGISTRY_FILE = "data/tickets.json"
+
+def _init_registry(data):
+    data.setdefault("last_ticket_id", 0)
+    data.setdefault("tickets", {})
+    data.setdefault("overflow_categories", {})
+
+# Loaded once at startup and written back in the background
+registry_store = JsonStore(REGISTRY_FILE, on_load=_init_registry)
+
+# (guild_id, owner_id) -> open ticket channel ID, rebuilt on startup from the ticket category
+open_tickets: Dict[Tuple[int, int], int] = {}
+
+def get_ticket(channel_id) -> Optional[Dict]:
+    """Get the registry record for a ticket channel, or None if it isn't a registered ticket"""
+    return registry_store.data["tickets"].get(str(channel_id))
+
+async def register_ticket(channel, owner, reason) -> Dict:
+    """Record a newly created ticket channel"""
+    async with file_lock(REGISTRY_FILE):
+        data = registry_store.data
+        data["last_ticket_id"] += 1
+        record = {
+            "ticket_id": data["last_ticket_id"],
+            "guild_id": channel.guild.id,
+            "channel_id": channel.id,
+            "owner_id": owner.id,
+            "reason": reason,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "claimer_id": None,
+            "claimer_name": None,
+            "member_ids": []
+        }
+        data["tickets"][str(channel.id)] = record
+        registry_store.mark_dirty(str(channel.id))
+    open_tickets[(channel.guild.id, owner.id)] = channel.id
+    return record
+
+async def update_ticket(channel_id, changes: Dict) -> Optional[Dict]:
+    """Merge changes into a ticket's record, returns the updated record"""
+    async with file_lock(REGISTRY_FILE):
+        record = get_ticket(channel_id)
+        if record is None:
+            return None
+        record.update(changes)
+        registry_store.mark_dirty(str(channel_id))
+    return record
+
+async def remove_ticket(channel_id) -> Optional[Dict]:
+    """Forget a ticket once its channel is gone"""
+    async with file_lock(REGISTRY_FILE):
+        record = registry_store.data["tickets"].pop(str(channel_id), None)
+        if record is not None:
+            registry_store.mark_dirty(str(channel_id))
+    return record
+
+def get_overflow_categories(guild_id) -> List[int]:
+    """Get the IDs of the overflow ticket categories the bot created in a guild"""
+    return registry_store.data["overflow_categories"].get(str(guild_id), [])
+
+async def add_overflow_category(guild_id, category_id):
+    """Remember an overflow ticket category the bot created"""
+    async with file_lock(REGISTRY_FILE):
+        registry_store.data["overflow_categories"].setdefault(str(guild_id), []).append(category_id)
+        registry_store.mark_dirty("overflow_categories")
+
+async def remove_overflow_category(guild_id, category_id):
+    """Forget an overflow ticket category once it's deleted"""
+    async with file_lock(REGISTRY_FILE):
+        category_ids = registry_store.data["overflow_categories"].get(str(guild_id), [])
+        if category_id in category_ids:
+            category_ids.remove(category_id)
+            registry_store.mark_dirty("overflow_categories")
+
+def get_open_ticket_channel(guild, user_id):
+    """Get a user's open ticket channel in a guild, or None"""
+    channel_id = open_tickets.get((guild.id, user_id))
+    return guild.get_channel(channel_id) if channel_id else None
+
+def _find_owner_id(channel):
+    """Work out who owns a ticket channel, for tickets opened before the registry existed"""
+    record = get_ticket(channel.id)
+    if record is not None:
+        return record["owner_id"]
+    # Older tickets are named after the owner, who is also given their own permission overwrite
+    for target in channel.overwrites:
+        if isinstance(target, discord.Member) and channel.name == f"ticket-{target.name.lower()}":
+            return target.id
+    return None
+
+async def index_open_tickets(guild, channels):
+    """Rebuild a guild's owner -> ticket channel index from its ticket channels, dropping records of deleted ones"""
+    for key in [key for key in open_tickets if key[0] == guild.id]:
+        del open_tickets[key]
+    for channel in channels:
+        owner_id = _find_owner_id(channel)
+        if owner_id is not None:
+            open_tickets[(guild.id, owner_id)] = channel.id
+    
+    # Tickets deleted while the bot was offline never got their delete event
+    if guild.unavailable:
+        return
+    stale = [
+        record["channel_id"] for record in registry_store.data["tickets"].values()
+        if record["guild_id"] == guild.id and guild.get_channel(record["channel_id"]) is None
+    ]
+    for channel_id in stale:
+        await remove_ticket(channel_id)
+
+def setup_ticket_registry(bot):
+    """Keep the registry and the open ticket index in step with ticket channels"""
+    
+    async def index_created_ticket(channel):
+        # Tickets made through the panel are indexed by register_ticket, this covers any created around it
+        record = get_ticket(channel.id)
+        if record is not None:
+            open_tickets[(channel.guild.id, record["owner_id"])] = channel.id
+    
+    async def forget_deleted_ticket(channel):
+        record = await remove_ticket(channel.id)
+        owner_id = record["owner_id"] if record else _find_owner_id(channel)
+        if owner_id is not None and open_tickets.get((channel.guild.id, owner_id)) == channel.id:
+            del open_tickets[(channel.guild.id, owner_id)]
+    
+    bot.add_listener(index_created_ticket, "on_guild_channel_create")
+    bot.add_listener(forget_deleted_ticket, "on_guild_channel_delete")
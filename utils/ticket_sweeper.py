@@ -0,0 +1,165 @@
+import asyncio
+import heapq
+import time
+from typing import Dict, List, Optional, Tuple
+import discord
+import config
+from utils.ticket_utils import is_ticket_channel, get_ticket_channels
+from commands.ticket_commands.ticket_close import log_ticket_close
+
+# Longest the sweeper sleeps between checks, so newly tracked tickets are never missed for long
+SWEEP_INTERVAL = 60.0
+# How many idle tickets are closed at the same time
+AUTO_CLOSE_CONCURRENCY = 3
+# How many recent messages are checked at startup when a ticket's last message is from a bot
+LOAD_HISTORY_LIMIT = 25
+# Longest wait before retrying a ticket that failed to close
+MAX_RETRY_BACKOFF = 3600.0
+
+class InactivitySweeper:
+    """Closes tickets that have had no messages from members for a while
+
+    last_activity is updated on every member message; the heap holds (deadline, channel_id)
+    entries that are only re-checked when they come due, so each tick touches just the
+    expired tickets. A popped entry whose channel saw activity since is pushed back with
+    its new deadline instead of being closed.
+    """
+
+    def __init__(self, idle_seconds: float, concurrency: int = AUTO_CLOSE_CONCURRENCY):
+        self.idle_seconds = idle_seconds
+        self.bot = None
+        self.last_activity: Dict[int, float] = {}  # channel_id -> time.time() of the last member message
+        self.heap: List[Tuple[float, int]] = []
+        self.closing = set()
+        self.failures: Dict[int, int] = {}  # channel_id -> failed auto-close attempts
+        self.notified = set()  # Channels already told they are being closed
+        self.logged = set()  # Channels whose close has been logged, only the delete is left to retry
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.task: Optional[asyncio.Task] = None
+
+    def touch(self, channel_id: int, timestamp: Optional[float] = None):
+        """Record activity in a ticket channel"""
+        timestamp = timestamp or time.time()
+        if channel_id not in self.last_activity:
+            heapq.heappush(self.heap, (timestamp + self.idle_seconds, channel_id))
+        self.last_activity[channel_id] = max(timestamp, self.last_activity.get(channel_id, 0))
+        if channel_id in self.failures and channel_id not in self.logged:
+            # The ticket is active again, a later auto-close starts over
+            self.failures.pop(channel_id)
+            self.notified.discard(channel_id)
+
+    def forget(self, channel_id: int):
+        """Stop tracking a channel (its heap entry is skipped when it comes up)"""
+        self.last_activity.pop(channel_id, None)
+        self.failures.pop(channel_id, None)
+        self.notified.discard(channel_id)
+        self.logged.discard(channel_id)
+
+    async def last_member_activity(self, channel) -> float:
+        """When a member last spoke in a ticket, bot messages don't count (same rule as the on_message listener)"""
+        last_message = channel.last_message
+        if last_message is not None and not last_message.author.bot:
+            return last_message.created_at.timestamp()
+        if channel.last_message_id is None:
+            return channel.created_at.timestamp()
+        # Only the newest messages are read, a ticket with none from members counts from its creation
+        async for message in channel.history(limit=LOAD_HISTORY_LIMIT):
+            if not message.author.bot:
+                return message.created_at.timestamp()
+        return channel.created_at.timestamp()
+
+    async def load(self):
+        """Track every open ticket from its last member message"""
+        self.last_activity = {}
+        self.heap = []
+        for guild in self.bot.guilds:
+            for channel in get_ticket_channels(guild):
+                try:
+                    self.touch(channel.id, await self.last_member_activity(channel))
+                except discord.HTTPException as e:
+                    print(f"Error reading activity for {channel}: {e}")
+                    self.touch(channel.id)
+
+    async def close_idle(self, channel):
+        hours = self.idle_seconds / 3600
+        close_reason = f"No activity for {hours:g} hours"
+        async with self.semaphore:
+            attempts = self.failures.get(channel.id, 0)
+            try:
+                if channel.id not in self.notified:
+                    await channel.send(f"This ticket has been closed automatically after {hours:g} hours without activity.")
+                    self.notified.add(channel.id)
+                # Logging DMs the owner and archives the transcript, so it's done once however often the delete fails
+                if channel.id not in self.logged:
+                    await log_ticket_close(channel, channel.guild.me, close_reason)
+                    self.logged.add(channel.id)
+                await channel.delete(reason=f"Ticket closed by {channel.guild.me} - {close_reason}")
+            except discord.Forbidden as e:
+                print(f"Error auto-closing {channel}, missing permissions so not retrying: {e}")
+                self.forget(channel.id)
+            except Exception as e:
+                # Keep tracking the ticket and try again later, backing off on repeated failures
+                self.failures[channel.id] = attempts + 1
+                retry_in = min(SWEEP_INTERVAL * 2 ** attempts, MAX_RETRY_BACKOFF)
+                print(f"Error auto-closing {channel}, retrying in {retry_in:g}s: {e}")
+                if channel.id in self.last_activity:
+                    heapq.heappush(self.heap, (time.time() + retry_in, channel.id))
+            else:
+                self.forget(channel.id)
+            finally:
+                self.closing.discard(channel.id)
+
+    async def run(self):
+        """Sleep until the next deadline (or SWEEP_INTERVAL), close what has expired, repeat"""
+        await self.load()
+        while True:
+            now = time.time()
+            timeout = SWEEP_INTERVAL
+            if self.heap:
+                timeout = min(timeout, max(0, self.heap[0][0] - now))
+            await asyncio.sleep(timeout)
+
+            now = time.time()
+            while self.heap and self.heap[0][0] <= now:
+                deadline, channel_id = heapq.heappop(self.heap)
+                last_activity = self.last_activity.get(channel_id)
+                if last_activity is None or channel_id in self.closing:
+                    continue
+                if last_activity + self.idle_seconds > now and channel_id not in self.logged:
+                    heapq.heappush(self.heap, (last_activity + self.idle_seconds, channel_id))
+                    continue
+                channel = self.bot.get_channel(channel_id)
+                if channel is None:
+                    self.forget(channel_id)
+                    continue
+                self.closing.add(channel_id)
+                asyncio.create_task(self.close_idle(channel))
+
+    def start(self, bot):
+        """Track the open tickets and start sweeping, safe to call on every on_ready"""
+        if self.idle_seconds <= 0 or (self.task is not None and not self.task.done()):
+            return
+        self.bot = bot
+        self.task = asyncio.create_task(self.run())
+
+
+# Global sweeper instance, started from on_ready (off unless TICKET_IDLE_HOURS is set)
+inactivity_sweeper = InactivitySweeper(getattr(config, "TICKET_IDLE_HOURS", 0) * 3600)
+
+def setup_inactivity_sweeper(bot):
+    """Register the listeners that keep ticket activity times current"""
+    
+    async def track_message(message):
+        if not message.author.bot and message.guild is not None and is_ticket_channel(message.channel):
+            inactivity_sweeper.touch(message.channel.id)
+    
+    async def track_new_ticket(channel):
+        if is_ticket_channel(channel):
+            inactivity_sweeper.touch(channel.id)
+    
+    async def forget_deleted_ticket(channel):
+        inactivity_sweeper.forget(channel.id)
+    
+    bot.add_listener(track_message, "on_message")
+    bot.add_listener(track_new_ticket, "on_guild_channel_create")
+    bot.add_listener(forget_deleted_ticket, "on_guild_channel_delete")
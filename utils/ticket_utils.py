@@ -1,12 +1,75 @@
+import asyncio
+import re
 import discord
 import config
+from utils.ticket_registry import register_ticket, get_overflow_categories, add_overflow_category, remove_overflow_category
+from utils.transcript_capture import start_capture
+
+# Discord's limit on channels in one category
+CATEGORY_CHANNEL_LIMIT = 50
+
+# guild_id -> ticket category IDs, the configured category first and overflow categories after it
+ticket_categories = {}
+# Every ticket category ID across guilds, for is_ticket_channel
+ticket_category_ids = {config.TICKET_CATEGORY_ID}
+_category_locks = {}
+
+def _overflow_name(base_name, number):
+    return f"{base_name} ({number})"
+
+def index_ticket_categories(guild):
+    """Find a guild's ticket category and the overflow categories the bot created for it"""
+    base = guild.get_channel(config.TICKET_CATEGORY_ID)
+    for category_id in ticket_categories.pop(guild.id, []):
+        ticket_category_ids.discard(category_id)
+    ticket_category_ids.add(config.TICKET_CATEGORY_ID)
+    if base is None:
+        return
+    # Only categories recorded when they were created, never ones that just share the name
+    overflow = [guild.get_channel(category_id) for category_id in get_overflow_categories(guild.id)]
+    overflow = sorted(
+        (category for category in overflow if isinstance(category, discord.CategoryChannel)),
+        key=lambda category: category.position
+    )
+    ticket_categories[guild.id] = [base.id] + [category.id for category in overflow]
+    ticket_category_ids.update(ticket_categories[guild.id])
+
+def category_lock(guild):
+    """Lock held while picking a ticket category and creating a channel in it, and while removing an empty one"""
+    return _category_locks.setdefault(guild.id, asyncio.Lock())
+
+async def get_ticket_category(guild):
+    """Get a ticket category with room for another channel, creating an overflow category if they're all full
+
+    Call with category_lock(guild) held until the ticket channel has been created in it.
+    """
+    if guild.id not in ticket_categories:
+        index_ticket_categories(guild)
+    categories = [guild.get_channel(category_id) for category_id in ticket_categories.get(guild.id, [])]
+    categories = [category for category in categories if category is not None]
+    for category in categories:
+        if len(category.channels) < CATEGORY_CHANNEL_LIMIT:
+            return category
+    if not categories:
+        return None
+
+    # Every category is full, add an overflow category right after the last one
+    base = categories[0]
+    numbers = [int(m.group(1)) for category in categories[1:] if (m := re.search(r"\((\d+)\)$", category.name))]
+    overflow = await guild.create_category(
+        name=_overflow_name(base.name, max(numbers, default=1) + 1),
+        overwrites=base.overwrites,
+        position=categories[-1].position + 1,
+        reason="Ticket categories are full"
+    )
+    await add_overflow_category(guild.id, overflow.id)
+    ticket_categories[guild.id].append(overflow.id)
+    ticket_category_ids.add(overflow.id)
+    return overflow
 
 async def create_ticket_channel(guild, user, reason):
     """Create a new ticket channel for a user"""
     try:
-        # Get category
-        category = guild.get_channel(config.TICKET_CATEGORY_ID)
-        
         # Set up permissions
         overwrites = {
             guild.default_role: discord.PermissionOverwrite(read_messages=False),
@@ -30,15 +93,19 @@ async def create_ticket_channel(guild, user, reason):
                     embed_links=True
                 )
         
-        # Create channel
+        # Create channel in a category with room left, holding the lock so concurrent tickets can't overfill it
         channel_name = f"ticket-{user.name.lower()}"
-        channel = await guild.create_text_channel(
-            name=channel_name,
-            category=category,
-            overwrites=overwrites,
-            reason=f"Ticket created by {user} - {reason}"
-        )
+        async with category_lock(guild):
+            category = await get_ticket_category(guild)
+            channel = await guild.create_text_channel(
+                name=channel_name,
+                category=category,
+                overwrites=overwrites,
+                reason=f"Ticket created by {user} - {reason}"
+            )
         
+        await start_capture(channel.id)
+        await register_ticket(channel, user, reason)
         return channel
         
     except Exception as e:
@@ -46,8 +113,47 @@ async def create_ticket_channel(guild, user, reason):
         return None
 
 def is_ticket_channel(channel):
-    """Check if a channel is a ticket channel by checking if it's in the ticket category"""
-    return channel.category_id == config.TICKET_CATEGORY_ID
+    """Check if a channel is a ticket channel by checking if it's in one of the ticket categories"""
+    return getattr(channel, "category_id", None) in ticket_category_ids
+
+def get_ticket_channels(guild):
+    """Get the open ticket channels in a guild"""
+    channels = []
+    for category_id in ticket_categories.get(guild.id, [config.TICKET_CATEGORY_ID]):
+        category = guild.get_channel(category_id)
+        if category is not None:
+            channels.extend(channel for channel in category.text_channels if channel.name.startswith("ticket-"))
+    return channels
+
+def setup_ticket_categories(bot):
+    """Remove overflow ticket categories once their last ticket is gone"""
+    
+    async def remove_empty_overflow(channel):
+        if isinstance(channel, discord.CategoryChannel):
+            # A ticket category itself was deleted
+            if channel.id in ticket_category_ids and channel.id != config.TICKET_CATEGORY_ID:
+                ticket_category_ids.discard(channel.id)
+                if channel.id in ticket_categories.get(channel.guild.id, []):
+                    ticket_categories[channel.guild.id].remove(channel.id)
+                await remove_overflow_category(channel.guild.id, channel.id)
+            return
+        category = channel.category
+        if category is None or category.id == config.TICKET_CATEGORY_ID or category.id not in ticket_category_ids:
+            return
+        async with category_lock(channel.guild):
+            # Re-check under the lock, a ticket may have just been created in it
+            if category.channels or category.id not in ticket_category_ids:
+                return
+            ticket_category_ids.discard(category.id)
+            if category.id in ticket_categories.get(channel.guild.id, []):
+                ticket_categories[channel.guild.id].remove(category.id)
+            await remove_overflow_category(channel.guild.id, category.id)
+            try:
+                await category.delete(reason="Overflow ticket category is empty")
+            except discord.NotFound:
+                pass
+    
+    bot.add_listener(remove_empty_overflow, "on_guild_channel_delete")
 
 def has_staff_permissions(member):
     """Check if a member has staff permissions"""
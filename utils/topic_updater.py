@@ -0,0 +1,57 @@
+import asyncio
+import time
+from typing import Dict
+import discord
+from utils.ticket_registry import get_ticket
+
+# Wait this long after a change before writing, so quick claim/unclaim runs collapse into one edit
+TOPIC_DEBOUNCE = 5.0
+# Discord allows two channel name/topic edits per 10 minutes, so space writes to one channel this far apart
+TOPIC_MIN_INTERVAL = 300.0
+
+def render_topic(record):
+    """Get the channel topic for a ticket's registry record"""
+    if record.get("claimer_id"):
+        return f"Claimed by: {record['claimer_name']}"
+    return ""
+
+class TopicUpdater:
+    """Writes ticket topics from the registry in the background, coalescing changes per channel"""
+
+    def __init__(self, debounce: float = TOPIC_DEBOUNCE, min_interval: float = TOPIC_MIN_INTERVAL):
+        self.debounce = debounce
+        self.min_interval = min_interval
+        self.pending: Dict[int, asyncio.Task] = {}
+        self.last_write: Dict[int, float] = {}  # channel_id -> time.monotonic() of the last edit
+
+    def schedule(self, channel):
+        """Queue a topic refresh; a refresh already waiting for this channel will pick up the new state"""
+        task = self.pending.get(channel.id)
+        if task is None or task.done():
+            self.pending[channel.id] = asyncio.create_task(self._write_later(channel))
+
+    async def _write_later(self, channel):
+        try:
+            delay = self.debounce
+            if channel.id in self.last_write:
+                delay = max(delay, self.last_write[channel.id] + self.min_interval - time.monotonic())
+            await asyncio.sleep(delay)
+            # Stop taking new changes into this write; anything after this schedules the next one
+            del self.pending[channel.id]
+
+            record = get_ticket(channel.id)
+            if record is None:
+                return  # Ticket was closed in the meantime
+            topic = render_topic(record)
+            if topic == (channel.topic or ""):
+                return
+            self.last_write[channel.id] = time.monotonic()
+            await channel.edit(topic=topic)
+        except discord.NotFound:
+            self.last_write.pop(channel.id, None)
+        except Exception as e:
+            print(f"Error updating topic for {channel}: {e}")
+
+
+# Global updater instance
+topic_updater = TopicUpdater()
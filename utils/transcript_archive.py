@@ -0,0 +1,175 @@
+import gzip
+import hashlib
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+from typing import Dict, Optional, Set
+
+ARCHIVE_DIR = os.path.join("data", "transcripts", "archive")
+OBJECTS_DIR = os.path.join(ARCHIVE_DIR, "objects")
+INDEX_PATH = os.path.join(ARCHIVE_DIR, "index.db")
+
+# Words shorter than this are too common to be worth indexing
+MIN_TERM_LENGTH = 2
+# Most terms a search uses, each one is a bound parameter in the postings query
+MAX_QUERY_TERMS = 16
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tickets (
+    ticket_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id INTEGER NOT NULL,
+    channel_id INTEGER,
+    channel_name TEXT,
+    owner_id INTEGER,
+    owner_name TEXT,
+    closed_by_id INTEGER,
+    claimed_by TEXT,
+    reason TEXT,
+    close_reason TEXT,
+    closed_at TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    blob TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tickets_guild ON tickets (guild_id, closed_at);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    ticket_id INTEGER NOT NULL,
+    PRIMARY KEY (term, ticket_id)
+) WITHOUT ROWID;
+"""
+
+_TERM_RE = re.compile(r"\w+")
+
+def index_terms(text: Optional[str]) -> Set[str]:
+    """Split text into lowercase search terms (user IDs and mentions become their digits)"""
+    if not text:
+        return set()
+    return {term for term in _TERM_RE.findall(text.lower()) if len(term) >= MIN_TERM_LENGTH}
+
+
+class TranscriptArchive:
+    """Closed-ticket transcripts stored by content hash, with an inverted index for search
+
+    Each transcript is gzip-compressed into objects/<hash[:2]>/<hash>.gz, named after
+    the SHA-256 of the uploaded bytes. SQLite holds one row per archived ticket and a
+    (term, ticket_id) postings table covering message text, author IDs and metadata.
+    """
+
+    def __init__(self, path: str = INDEX_PATH, objects_dir: str = OBJECTS_DIR):
+        self.objects_dir = objects_dir
+        os.makedirs(objects_dir, exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def blob_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], f"{digest}.gz")
+
+    def store_blob(self, fileobj, compressed: bool = False) -> str:
+        """Copy a transcript into the object store, returns its content hash"""
+        fileobj.seek(0)
+        fd, tmp_path = tempfile.mkstemp(dir=self.objects_dir, prefix=".tmp-")
+        digest = hashlib.sha256()
+        try:
+            with os.fdopen(fd, "wb") as raw:
+                out = raw if compressed else gzip.GzipFile(fileobj=raw, mode="wb", mtime=0)
+                for chunk in iter(lambda: fileobj.read(64 * 1024), b""):
+                    digest.update(chunk)
+                    out.write(chunk)
+                if out is not raw:
+                    out.close()
+            path = self.blob_path(digest.hexdigest())
+            if os.path.exists(path):
+                os.remove(tmp_path)  # Same content is already archived
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        fileobj.seek(0)
+        return digest.hexdigest()
+
+    def archive(self, transcript, meta: Dict) -> int:
+        """Store a finished transcript and index it, returns the archive ticket ID"""
+        compressed = transcript.filename.endswith(".gz")
+        blob = self.store_blob(transcript.buffer, compressed=compressed)
+        filename = transcript.filename if compressed else transcript.filename + ".gz"
+
+        terms = set(transcript.terms)
+        for key in ("channel_name", "owner_name", "claimed_by", "reason", "close_reason"):
+            terms |= index_terms(meta.get(key))
+        for key in ("owner_id", "closed_by_id"):
+            if meta.get(key):
+                terms.add(str(meta[key]))
+
+        with self.lock, self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO tickets (guild_id, channel_id, channel_name, owner_id, owner_name, closed_by_id, "
+                "claimed_by, reason, close_reason, closed_at, filename, blob) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (meta["guild_id"], meta.get("channel_id"), meta.get("channel_name"), meta.get("owner_id"),
+                 meta.get("owner_name"), meta.get("closed_by_id"), meta.get("claimed_by"), meta.get("reason"),
+                 meta.get("close_reason"), meta["closed_at"], filename, blob)
+            )
+            ticket_id = cursor.lastrowid
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO postings VALUES (?, ?)", ((term, ticket_id) for term in terms)
+            )
+        return ticket_id
+
+    def search(self, guild_id: int, query: str, limit: int = 10) -> tuple:
+        """Find archived tickets containing every term in the query, newest first
+
+        Returns (matching tickets up to limit, total number of matches).
+        """
+        # Longer terms are the most selective, so those are kept when a query has too many
+        terms = sorted(index_terms(query), key=len, reverse=True)[:MAX_QUERY_TERMS]
+        if not terms:
+            return [], 0
+        placeholders = ", ".join("?" * len(terms))
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT t.*, COUNT(*) OVER () AS total FROM tickets t JOIN ("
+                f"SELECT ticket_id FROM postings WHERE term IN ({placeholders}) "
+                "GROUP BY ticket_id HAVING COUNT(DISTINCT term) = ?"
+                ") USING (ticket_id) WHERE t.guild_id = ? ORDER BY t.closed_at DESC LIMIT ?",
+                (*terms, len(terms), guild_id, limit)
+            ).fetchall()
+        if not rows:
+            return [], 0
+        total = rows[0]["total"]
+        results = []
+        for row in rows:
+            ticket = dict(row)
+            del ticket["total"]
+            results.append(ticket)
+        return results, total
+
+    def get_ticket(self, guild_id: int, ticket_id: int) -> Optional[Dict]:
+        """Get an archived ticket's metadata"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT * FROM tickets WHERE guild_id = ? AND ticket_id = ?", (guild_id, ticket_id)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def close(self):
+        self.conn.close()
+
+
+# Global archive instance, opened on first use
+_archive = None
+
+def get_transcript_archive() -> TranscriptArchive:
+    """Get the shared transcript archive, opening it on first use"""
+    global _archive
+    if _archive is None:
+        _archive = TranscriptArchive()
+    return _archive
@@ -0,0 +1,168 @@
+import json
+import os
+import discord
+from utils.storage import file_lock, run_io
+from utils.transcript_utils import Transcript, message_entry, build_transcript
+
+# One append-only log per open ticket, written as messages arrive
+CAPTURE_DIR = "data/transcripts/live"
+
+# Channels whose log was started when the ticket was created; nothing else is captured,
+# so a log always holds the whole conversation
+captured_channels = set()
+
+def capture_path(channel_id):
+    """Get the path of a ticket's live capture log"""
+    return os.path.join(CAPTURE_DIR, f"{channel_id}.jsonl")
+
+def load_captured_channels(bot=None):
+    """Pick up the logs of tickets that were open when the bot last stopped
+
+    Once the bot is ready and passed in, logs of channels that no longer exist are deleted.
+    """
+    # An unavailable guild's channels don't resolve yet, so nothing is pruned until every guild is back
+    prune = bot is not None and not any(guild.unavailable for guild in bot.guilds)
+    captured_channels.clear()
+    if os.path.isdir(CAPTURE_DIR):
+        for filename in os.listdir(CAPTURE_DIR):
+            name, extension = os.path.splitext(filename)
+            if extension == ".jsonl" and name.isdigit():
+                if prune and bot.get_channel(int(name)) is None:
+                    _remove(os.path.join(CAPTURE_DIR, filename))
+                    continue
+                captured_channels.add(int(name))
+
+def _append_line(path, line):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(line)
+
+def _index_log(path):
+    """Scan a capture log once, returns (message IDs in log order, ID -> offset of its latest version, last message ID)
+
+    Deleted messages map to None. Only these offsets are held, never the messages themselves.
+    """
+    order = []
+    latest = {}
+    last_id = None
+    offset = 0
+    with open(path, "rb") as f:
+        for line in f:
+            line_offset = offset
+            offset += len(line)
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Torn write from a crash
+            message_id = event["id"]
+            if event["op"] == "message":
+                if message_id not in latest:
+                    order.append(message_id)
+                latest[message_id] = line_offset
+                last_id = max(last_id or 0, message_id)
+            elif event["op"] == "edit" and latest.get(message_id) is not None:
+                latest[message_id] = line_offset
+            elif event["op"] == "delete":
+                latest[message_id] = None
+    return order, latest, last_id
+
+def _render_log(path, channel_name):
+    """Stream a capture log into a transcript, reading each message's latest version by offset"""
+    order, latest, _ = _index_log(path)
+    transcript = Transcript(channel_name)
+    with open(path, "rb") as f:
+        for message_id in order:
+            offset = latest[message_id]
+            if offset is None:
+                continue
+            f.seek(offset)
+            entry = json.loads(f.readline())
+            del entry["op"]
+            transcript.add(entry)
+    transcript.finish()
+    return transcript, transcript.ticket_reason or "No reason provided"
+
+def _remove(path):
+    if os.path.exists(path):
+        os.remove(path)
+
+async def start_capture(channel_id):
+    """Create the capture log for a new ticket, before anything is posted in it"""
+    path = capture_path(channel_id)
+    async with file_lock(path):
+        await run_io(_append_line, path, "")
+    captured_channels.add(channel_id)
+
+async def record_event(channel_id, op, entry):
+    """Append one event to a ticket's capture log"""
+    path = capture_path(channel_id)
+    line = json.dumps({"op": op, **entry}) + "\n"
+    async with file_lock(path):
+        await run_io(_append_line, path, line)
+
+async def finalize_transcript(channel):
+    """Render a ticket's transcript from its capture log
+
+    Only messages sent while the bot was offline are fetched from history. Tickets
+    whose log wasn't started at creation (opened before capture existed, or whose
+    log went missing) fall back to a full history pass.
+    Returns (transcript, ticket_reason) like build_transcript.
+    """
+    path = capture_path(channel.id)
+    if channel.id not in captured_channels or not os.path.exists(path):
+        return await build_transcript(channel)
+    async with file_lock(path):
+        _, _, last_id = await run_io(_index_log, path)
+        
+        # Append anything missed while the bot was down, so the log is complete
+        after = discord.Object(id=last_id) if last_id else None
+        missed = []
+        async for message in channel.history(limit=None, after=after, oldest_first=True):
+            missed.append(json.dumps({"op": "message", **message_entry(message)}) + "\n")
+            if len(missed) >= 100:
+                await run_io(_append_line, path, "".join(missed))
+                missed = []
+        if missed:
+            await run_io(_append_line, path, "".join(missed))
+        
+        return await run_io(_render_log, path, channel.name)
+
+def _is_ticket_message(message):
+    return message.channel.id in captured_channels
+
+def setup_transcript_capture(bot):
+    """Register the listeners that keep ticket capture logs current"""
+    load_captured_channels()
+    
+    async def capture_message(message):
+        if _is_ticket_message(message):
+            try:
+                await record_event(message.channel.id, "message", message_entry(message))
+            except Exception as e:
+                print(f"Error capturing message in {message.channel}: {e}")
+    
+    async def capture_edit(before, after):
+        if _is_ticket_message(after):
+            try:
+                await record_event(after.channel.id, "edit", message_entry(after))
+            except Exception as e:
+                print(f"Error capturing edit in {after.channel}: {e}")
+    
+    async def capture_delete(message):
+        if _is_ticket_message(message):
+            try:
+                await record_event(message.channel.id, "delete", {"id": message.id})
+            except Exception as e:
+                print(f"Error capturing delete in {message.channel}: {e}")
+    
+    async def discard_capture(channel):
+        # The ticket is gone (closed or deleted by hand), so its log is no longer needed
+        captured_channels.discard(channel.id)
+        path = capture_path(channel.id)
+        async with file_lock(path):
+            await run_io(_remove, path)
+    
+    bot.add_listener(capture_message, "on_message")
+    bot.add_listener(capture_edit, "on_message_edit")
+    bot.add_listener(capture_delete, "on_message_delete")
+    bot.add_listener(discard_capture, "on_guild_channel_delete")
@@ -1,41 +1,260 @@
-
 import discord
-import io
+import gzip
+import html
+import string
+import tempfile
 from datetime import datetime
+import config
+from utils.transcript_archive import index_terms
+from utils.ticket_registry import get_ticket
 
-async def generate_transcript(channel):
-    """Generate a transcript of a ticket channel"""
-    transcript_content = f"Generated by SereneEnterprise, all rights reserved (c) (Taken from Almora Retail)\n"
-    transcript_content += f"Transcript for {channel.name}\n"
-    transcript_content += f"Generated on: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')} UTC\n"
-    transcript_content += "=" * 50 + "\n\n"
-    
-    async for message in channel.history(limit=None, oldest_first=True):
-        timestamp = message.created_at.strftime('%Y-%m-%d %H:%M:%S')
-        author = f"{message.author.display_name} ({message.author})"
-        content = message.content if message.content else "[No text content]"
+# Transcripts stay in memory up to this size, then spill to a temp file on disk
+TRANSCRIPT_SPOOL_SIZE = 1024 * 1024
+
+def message_entry(message):
+    """Capture the parts of a message that go into a transcript as a plain dict"""
+    return {
+        "id": message.id,
+        "created_at": message.created_at.strftime('%Y-%m-%d %H:%M:%S'),
+        "author": f"{message.author.display_name} ({message.author})",
+        "author_id": message.author.id,
+        "avatar_url": message.author.display_avatar.url,
+        "content": message.content,
+        "embeds": [
+            {
+                "title": embed.title,
+                "description": embed.description,
+                "fields": [{"name": field.name, "value": field.value} for field in embed.fields]
+            }
+            for embed in message.embeds
+        ],
+        "attachments": [{"filename": attachment.filename, "url": attachment.url} for attachment in message.attachments]
+    }
+
+def _attachments(entry):
+    # Capture logs written before attachment URLs were recorded only hold filenames
+    return [{"filename": attachment, "url": None} if isinstance(attachment, str) else attachment for attachment in entry["attachments"]]
+
+def find_ticket_reason(entry):
+    """Get the reason from a ticket's opening embed, or None if this entry isn't it"""
+    if entry["embeds"] and "Support Ticket" in str(entry["embeds"][0]["title"]):
+        embed_desc = entry["embeds"][0]["description"] or ""
+        if "**Reason:**" in embed_desc:
+            return embed_desc.split("**Reason:**")[1].split("\n")[0].strip()
+        return "No reason provided"
+    return None
+
+class TranscriptRenderer:
+    """A transcript format: a header, one chunk of text per message and a footer"""
+    name = None
+    extension = None
+
+    def header(self, channel_name, generated_on):
+        raise NotImplementedError
+
+    def entry(self, entry):
+        raise NotImplementedError
+
+    def footer(self):
+        return ""
+
+class TextRenderer(TranscriptRenderer):
+    """The plain-text transcript format"""
+    name = "text"
+    extension = "txt"
+
+    def header(self, channel_name, generated_on):
+        header = "Generated by SereneEnterprise, all rights reserved (c) (Taken from Almora Retail)\n"
+        header += f"Transcript for {channel_name}\n"
+        header += f"Generated on: {generated_on} UTC\n"
+        return header + "=" * 50 + "\n\n"
+
+    def entry(self, entry):
+        parts = [entry["content"] if entry["content"] else "[No text content]"]
         
         # Handle embeds
-        if message.embeds:
-            for embed in message.embeds:
-                if embed.title:
-                    content += f"\n[EMBED] {embed.title}"
-                if embed.description:
-                    content += f"\n{embed.description}"
+        for embed in entry["embeds"]:
+            if embed["title"]:
+                parts.append(f"[EMBED] {embed['title']}")
+            if embed["description"]:
+                parts.append(embed["description"])
         
         # Handle attachments
-        if message.attachments:
-            for attachment in message.attachments:
-                content += f"\n[ATTACHMENT] {attachment.filename}"
+        for attachment in _attachments(entry):
+            parts.append(f"[ATTACHMENT] {attachment['filename']}")
         
-        transcript_content += f"[{timestamp}] {author}: {content}\n"
-    
-    # Create a file-like object
-    transcript_file = io.StringIO(transcript_content)
-    return discord.File(transcript_file, filename=f"{channel.name}-transcript.txt")
+        content = "\n".join(parts)
+        return f"[{entry['created_at']}] {entry['author']}: {content}\n"
+
+# HTML templates, compiled once at import
+HTML_HEADER = string.Template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Transcript for $channel_name</title>
+<style>
+body { font-family: sans-serif; background: #313338; color: #dbdee1; margin: 0; padding: 16px; }
+header { border-bottom: 1px solid #4e5058; margin-bottom: 16px; }
+.message { display: flex; gap: 12px; padding: 6px 0; }
+.avatar { width: 40px; height: 40px; border-radius: 50%; }
+.author { font-weight: bold; color: #fff; }
+.time { color: #949ba4; font-size: 0.8em; margin-left: 6px; }
+.content { white-space: pre-wrap; }
+.embed { border-left: 4px solid #fff; background: #2b2d31; padding: 8px 12px; margin-top: 4px; border-radius: 4px; }
+.embed-title { font-weight: bold; }
+.field-name { font-weight: bold; margin-top: 6px; }
+a { color: #00a8fc; }
+</style>
+</head>
+<body>
+<header>
+<p>Generated by SereneEnterprise, all rights reserved (c) (Taken from Almora Retail)</p>
+<h1>Transcript for $channel_name</h1>
+<p>Generated on: $generated_on UTC</p>
+</header>
+""")
+HTML_MESSAGE = string.Template("""<div class="message" id="m$id">
+<img class="avatar" src="$avatar_url" alt="">
+<div>
+<div><span class="author" title="$author_id">$author</span><span class="time">$created_at</span></div>
+<div class="content">$content</div>
+$embeds$attachments</div>
+</div>
+""")
+HTML_EMBED = string.Template("""<div class="embed">
+<div class="embed-title">$title</div>
+<div class="content">$description</div>
+$fields</div>
+""")
+HTML_FIELD = string.Template("""<div class="field-name">$name</div>
+<div class="content">$value</div>
+""")
+HTML_ATTACHMENT = string.Template("""<div><a href="$url">$filename</a></div>
+""")
+HTML_FOOTER = "</body>\n</html>\n"
+
+class HtmlRenderer(TranscriptRenderer):
+    """A standalone HTML page with avatars, embed fields and attachment links"""
+    name = "html"
+    extension = "html"
+
+    def header(self, channel_name, generated_on):
+        return HTML_HEADER.substitute(channel_name=html.escape(channel_name), generated_on=generated_on)
+
+    def entry(self, entry):
+        embeds = "".join(
+            HTML_EMBED.substitute(
+                title=html.escape(embed["title"] or ""),
+                description=html.escape(embed["description"] or ""),
+                fields="".join(
+                    HTML_FIELD.substitute(name=html.escape(field["name"] or ""), value=html.escape(field["value"] or ""))
+                    for field in embed.get("fields", ())
+                )
+            )
+            for embed in entry["embeds"]
+        )
+        attachments = "".join(
+            HTML_ATTACHMENT.substitute(url=html.escape(attachment["url"] or "", quote=True), filename=html.escape(attachment["filename"]))
+            for attachment in _attachments(entry)
+        )
+        return HTML_MESSAGE.substitute(
+            id=entry["id"],
+            avatar_url=html.escape(entry.get("avatar_url") or "", quote=True),
+            author_id=entry.get("author_id", ""),
+            author=html.escape(entry["author"]),
+            created_at=entry["created_at"],
+            content=html.escape(entry["content"] or ""),
+            embeds=embeds,
+            attachments=attachments
+        )
+
+    def footer(self):
+        return HTML_FOOTER
+
+RENDERERS = {renderer.name: renderer for renderer in (TextRenderer(), HtmlRenderer())}
+
+def get_renderer(name=None):
+    """Get a renderer by name, defaulting to the configured transcript format"""
+    name = name or getattr(config, "TRANSCRIPT_FORMAT", "text")
+    return RENDERERS.get(name, RENDERERS["text"])
+
+class Transcript:
+    """A transcript being rendered into a spooled buffer, optionally gzip-compressed
+
+    The whole transcript is never held as one string: each rendered message goes
+    straight into the buffer, which stays in memory up to TRANSCRIPT_SPOOL_SIZE
+    and then spills to disk. The caller owns it and must close() it.
+    """
+
+    def __init__(self, channel_name, renderer=None, compress=None):
+        self.renderer = renderer or get_renderer()
+        if compress is None:
+            compress = getattr(config, "TRANSCRIPT_GZIP", False)
+        self.filename = f"{channel_name}-transcript.{self.renderer.extension}" + (".gz" if compress else "")
+        self.ticket_reason = None
+        self.terms = set()  # Search terms for the archive index
+        self.buffer = tempfile.SpooledTemporaryFile(max_size=TRANSCRIPT_SPOOL_SIZE, mode="w+b")
+        self.stream = gzip.GzipFile(fileobj=self.buffer, mode="wb", mtime=0) if compress else self.buffer
+        self.stream.write(self.renderer.header(channel_name, datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')).encode("utf-8"))
+
+    def add(self, entry):
+        """Render one message entry, picking up the ticket reason and search terms along the way"""
+        if self.ticket_reason is None:
+            self.ticket_reason = find_ticket_reason(entry)
+        self.stream.write(self.renderer.entry(entry).encode("utf-8"))
+        
+        self.terms |= index_terms(entry["content"])
+        for embed in entry["embeds"]:
+            self.terms |= index_terms(embed["title"])
+            self.terms |= index_terms(embed["description"])
+            for field in embed.get("fields", ()):
+                self.terms |= index_terms(field["name"])
+                self.terms |= index_terms(field["value"])
+        if entry.get("author_id"):
+            self.terms.add(str(entry["author_id"]))
+
+    def finish(self):
+        """Write the footer and flush the compressor, after which the transcript can be uploaded"""
+        self.stream.write(self.renderer.footer().encode("utf-8"))
+        if self.stream is not self.buffer:
+            self.stream.close()  # Closes the gzip stream only, not the buffer underneath
+        self.buffer.seek(0)
+        return self
+
+    def close(self):
+        self.buffer.close()
+
+async def build_transcript(channel):
+    """Render a ticket channel's transcript in one history pass
+
+    Returns (transcript, ticket_reason). The same transcript can be attached to
+    several messages with transcript_file before the caller closes it.
+    """
+    transcript = Transcript(channel.name)
+    async for message in channel.history(limit=None, oldest_first=True):
+        transcript.add(message_entry(message))
+    transcript.finish()
+    return transcript, transcript.ticket_reason or "No reason provided"
+
+def transcript_file(transcript):
+    """Wrap a finished transcript for upload, rewinding it so it can be sent more than once"""
+    transcript.buffer.seek(0)
+    return discord.File(transcript.buffer, filename=transcript.filename)
+
+async def generate_transcript(channel):
+    """Generate a transcript of a ticket channel"""
+    transcript, _ = await build_transcript(channel)
+    return transcript_file(transcript)
 
 def get_ticket_info_from_channel(channel):
-    """Extract ticket information from channel name and topic"""
+    """Get a ticket's owner and claimer, from the registry or (for older tickets) the channel name and topic"""
+    record = get_ticket(channel.id)
+    if record is not None:
+        ticket_owner = channel.guild.get_member(record["owner_id"])
+        claimer = channel.guild.get_member(record["claimer_id"]) if record["claimer_id"] else None
+        claimed_by = claimer.display_name if claimer else record["claimer_name"]
+        return ticket_owner, claimed_by
+    
     ticket_owner = None
     claimed_by = None
     
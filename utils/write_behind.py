@@ -0,0 +1,175 @@
+import asyncio
+import json
+import os
+import tempfile
+import threading
+from typing import Callable, List, Optional
+from utils.storage import file_lock, run_io
+
+# Flush every FLUSH_INTERVAL seconds, or sooner once a store has FLUSH_EVERY pending mutations
+FLUSH_INTERVAL = 5.0
+FLUSH_EVERY = 50
+
+
+def atomic_write(path: str, payload: str):
+    """Write a file by renaming a fully written temp file over it"""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=os.path.basename(path))
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class WriteBehindStore:
+    """Base class for stores that live in memory and flush dirty keys to disk in batches"""
+
+    def __init__(self, name: str, flush_every: int = FLUSH_EVERY):
+        self.name = name
+        self.flush_every = flush_every
+        self.lock = threading.RLock()
+        self.dirty = set()
+        register_store(self)
+
+    def mark_dirty(self, key):
+        """Record that a key changed; wakes the flusher once enough changes pile up"""
+        with self.lock:
+            self.dirty.add(key)
+            pending = len(self.dirty)
+        if pending >= self.flush_every:
+            request_flush()
+
+    def snapshot(self, keys: set):
+        """Copy whatever write() needs while the lock is held"""
+        raise NotImplementedError
+
+    def write(self, keys: set, snapshot):
+        """Persist a snapshot of the given dirty keys (runs outside the lock)"""
+        raise NotImplementedError
+
+    def refresh(self) -> bool:
+        """Pick up changes made outside this process, returns whether anything was reloaded"""
+        return False
+
+    def flush(self) -> int:
+        """Write all pending changes, returns how many keys were flushed"""
+        with self.lock:
+            if not self.dirty:
+                return 0
+            keys = self.dirty
+            self.dirty = set()
+            snapshot = self.snapshot(keys)
+        try:
+            self.write(keys, snapshot)
+        except Exception:
+            # Put the keys back so the next flush retries them
+            with self.lock:
+                self.dirty |= keys
+            raise
+        return len(keys)
+
+
+class JsonStore(WriteBehindStore):
+    """A dict loaded once from a JSON file and written back with an atomic rename
+
+    If the file is edited outside the bot (its mtime changes), refresh() reloads it
+    and calls on_load so derived indexes can be rebuilt.
+    """
+
+    def __init__(self, path: str, flush_every: int = FLUSH_EVERY, on_load: Optional[Callable[[dict], None]] = None):
+        super().__init__(path, flush_every)
+        self.path = path
+        self.on_load = on_load
+        self.mtime = None
+        self.data = self.load()
+
+    def _get_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def load(self) -> dict:
+        """Read the file from disk"""
+        self.mtime = self._get_mtime()
+        data = {}
+        if self.mtime is not None:
+            try:
+                with open(self.path, "r") as f:
+                    data = json.load(f)
+            except (json.JSONDecodeError, OSError) as e:
+                print(f"Failed to load {self.path}: {e}")
+        if self.on_load:
+            self.on_load(data)
+        return data
+
+    def refresh(self) -> bool:
+        with self.lock:
+            # Local changes win until they have been flushed
+            if self.dirty or self._get_mtime() == self.mtime:
+                return False
+            self.data = self.load()
+        print(f"Reloaded {self.path} after an external change")
+        return True
+
+    def snapshot(self, keys):
+        return json.dumps(self.data, indent=2)
+
+    def write(self, keys, snapshot):
+        atomic_write(self.path, snapshot)
+        self.mtime = self._get_mtime()
+
+
+# Every store created in this process, flushed together by the background task
+_stores: List[WriteBehindStore] = []
+_wake: Optional[asyncio.Event] = None
+_flusher_task: Optional[asyncio.Task] = None
+
+def register_store(store: WriteBehindStore):
+    """Add a store to the shared flusher"""
+    _stores.append(store)
+
+def request_flush():
+    """Ask the background flusher to run now instead of waiting for the timer"""
+    if _wake is not None:
+        _wake.set()
+
+def flush_all():
+    """Synchronously flush every store (used at shutdown)"""
+    for store in _stores:
+        try:
+            store.flush()
+        except Exception as e:
+            print(f"Failed to flush {store.name}: {e}")
+
+async def _flush_loop(interval: float):
+    """Background loop that flushes dirty stores and reloads externally edited ones on the storage pool"""
+    while True:
+        try:
+            await asyncio.wait_for(_wake.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
+        _wake.clear()
+        for store in _stores:
+            try:
+                async with file_lock(store.name):
+                    await run_io(store.flush)
+                    await run_io(store.refresh)
+            except Exception as e:
+                print(f"Failed to flush {store.name}: {e}")
+
+def start_flusher(interval: float = FLUSH_INTERVAL):
+    """Start the background flusher, safe to call on every on_ready"""
+    global _wake, _flusher_task
+    if _flusher_task is not None and not _flusher_task.done():
+        return _flusher_task
+    _wake = asyncio.Event()
+    _flusher_task = asyncio.create_task(_flush_loop(interval))
+    return _flusher_task